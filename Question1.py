@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 
 def get_translation_matrix(dx, dy, dz):
     """Create 4x4 translation matrix"""
@@ -32,51 +30,63 @@ def get_scaling_matrix(sx, sy, sz):
         [0, 0, 0, 1]
     ])
 
-# Define original triangle vertices (homogeneous coordinates)
-triangle = np.array([
+# Original triangle vertices (homogeneous coordinates)
+TRIANGLE = np.array([
     [0, 0, 0, 1],  # Vertex 1
     [1, 0, 0, 1],  # Vertex 2
     [0.5, 1, 0, 1],  # Vertex 3
     [0, 0, 0, 1]   # Close the triangle
 ])
 
-# Define transformation matrices
-translation = get_translation_matrix(4, 0, 2)  # Translate by (4, 0, 2)
-rotation = get_z_rotation_matrix(90)          # Rotate 90° around Z-axis
-scaling = get_scaling_matrix(2, 3, 4)         # Scale by (2, 3, 4)
+def solve(translation=(4, 0, 2), degrees=90, scale=(2, 3, 4), point=(1, 2, 3)):
+    """Translate + rotate about Z + scale the triangle and the point P"""
+    T = get_translation_matrix(*translation)
+    R = get_z_rotation_matrix(degrees)
+    S = get_scaling_matrix(*scale)
+    M = T @ R @ S
+    P = np.array([*point, 1])
+    return {
+        'translation': T, 'rotation': R, 'scaling': S, 'composite': M,
+        'triangle': TRIANGLE, 'transformed_triangle': (M @ TRIANGLE.T).T,
+        'point': P, 'transformed_point': M @ P,
+    }
 
-# Apply transformations to triangle
-transformed_triangle = (translation @ rotation @ scaling @ triangle.T).T
+def plot(result=None):
+    """3D plot of the original and transformed triangle; returns the figure"""
+    import matplotlib.pyplot as plt
+    result = result or solve()
+    triangle, transformed_triangle = result['triangle'], result['transformed_triangle']
 
-# Apply transformations to point P = (1, 2, 3)
-P = np.array([1, 2, 3, 1])
-P_transformed = translation @ rotation @ scaling @ P
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection='3d')
 
-# Create 3D plot
-fig = plt.figure(figsize=(10, 8))
-ax = fig.add_subplot(111, projection='3d')
+    # Plot original triangle (red)
+    ax.plot(triangle[:, 0], triangle[:, 1], triangle[:, 2],
+            'r-', label="Original Triangle", linewidth=3)
 
-# Plot original triangle (red)
-ax.plot(triangle[:, 0], triangle[:, 1], triangle[:, 2], 
-        'r-', label="Original Triangle", linewidth=3)
+    # Plot transformed triangle (green dashed)
+    ax.plot(transformed_triangle[:, 0], transformed_triangle[:, 1], transformed_triangle[:, 2],
+            'g--', label="Transformed Triangle", linewidth=3)
 
-# Plot transformed triangle (green dashed)
-ax.plot(transformed_triangle[:, 0], transformed_triangle[:, 1], transformed_triangle[:, 2],
-        'g--', label="Transformed Triangle", linewidth=3)
+    # Configure plot
+    ax.set_xlabel('X Axis')
+    ax.set_ylabel('Y Axis')
+    ax.set_zlabel('Z Axis')
+    ax.set_title('3D Triangle Transformations\n(Translation + Rotation + Scaling)')
+    ax.legend()
 
-# Configure plot
-ax.set_xlabel('X Axis')
-ax.set_ylabel('Y Axis')
-ax.set_zlabel('Z Axis')
-ax.set_title('3D Triangle Transformations\n(Translation + Rotation + Scaling)')
-ax.legend()
+    fig.tight_layout()
+    return fig
 
-plt.tight_layout()
-plt.show()  
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    result = solve()
+    plot(result)
+    plt.show()
 
-# Print matrices and results
-print("Translation Matrix:\n", translation)
-print("\nRotation Matrix (90° around Z):\n", rotation)
-print("\nScaling Matrix:\n", scaling)
-print("\nOriginal point P:", P[:3])
-print("Transformed point P':", P_transformed[:3])
\ No newline at end of file
+    # Print matrices and results
+    print("Translation Matrix:\n", result['translation'])
+    print("\nRotation Matrix (90° around Z):\n", result['rotation'])
+    print("\nScaling Matrix:\n", result['scaling'])
+    print("\nOriginal point P:", result['point'][:3])
+    print("Transformed point P':", result['transformed_point'][:3])
@@ -1,9 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
 # Define vertices of a cube centered at origin
-cube_vertices = np.array([
+CUBE_VERTICES = np.array([
     [-1, -1, -1, 1],
     [ 1, -1, -1, 1],
     [ 1,  1, -1, 1],
@@ -15,7 +13,7 @@ cube_vertices = np.array([
 ]).T  # shape (4, 8)
 
 # Faces of the cube
-faces = [
+FACES = [
     [0, 1, 2, 3],  # bottom
     [4, 5, 6, 7],  # top
     [0, 1, 5, 4],  # front
@@ -25,78 +23,94 @@ faces = [
 ]
 
 # Step 1: Scaling matrix (scale x by 2, y by 1.5, z by 1)
-scale_matrix = np.array([
-    [2.0, 0,   0,   0],
-    [0,   1.5, 0,   0],
-    [0,   0,   1.0, 0],
-    [0,   0,   0,   1]
-])
+def scale_matrix(sx=2.0, sy=1.5, sz=1.0):
+    return np.array([
+        [sx,  0,  0,  0],
+        [0,   sy, 0,  0],
+        [0,   0,  sz, 0],
+        [0,   0,  0,  1]
+    ])
 
 # Step 2: Rotation matrix around Z-axis (30 degrees)
-theta = np.radians(30)
-cos_t = np.cos(theta)
-sin_t = np.sin(theta)
+def rotation_matrix(degrees=30):
+    theta = np.radians(degrees)
+    cos_t = np.cos(theta)
+    sin_t = np.sin(theta)
 
-rotation_matrix = np.array([
-    [cos_t, -sin_t, 0, 0],
-    [sin_t,  cos_t, 0, 0],
-    [0,      0,     1, 0],
-    [0,      0,     0, 1]
-])
+    return np.array([
+        [cos_t, -sin_t, 0, 0],
+        [sin_t,  cos_t, 0, 0],
+        [0,      0,     1, 0],
+        [0,      0,     0, 1]
+    ])
 
 # Step 3: Translation matrix (translate by x=3, y=2, z=1)
-translation_matrix = np.array([
-    [1, 0, 0, 3],
-    [0, 1, 0, 2],
-    [0, 0, 1, 1],
-    [0, 0, 0, 1]
-])
-
-# Combine transformations: T * R * S
-combined_matrix = translation_matrix @ rotation_matrix @ scale_matrix
-
-# Apply transformation
-transformed_vertices = combined_matrix @ cube_vertices
+def translation_matrix(dx=3, dy=2, dz=1):
+    return np.array([
+        [1, 0, 0, dx],
+        [0, 1, 0, dy],
+        [0, 0, 1, dz],
+        [0, 0, 0, 1]
+    ])
 
 # Function to extract face vertices
 def get_faces(verts):
-    return [[verts[:3, i] for i in face] for face in faces]
+    return [[verts[:3, i] for i in face] for face in FACES]
+
+def solve(scale=(2.0, 1.5, 1.0), degrees=30, translation=(3, 2, 1)):
+    """Scale, rotate around Z, then translate the cube (as columns)"""
+    S = scale_matrix(*scale)
+    R = rotation_matrix(degrees)
+    T = translation_matrix(*translation)
+    # Combine transformations: T * R * S
+    combined_matrix = T @ R @ S
+    return {'scale': S, 'rotation': R, 'translation': T, 'combined': combined_matrix,
+            'cube': CUBE_VERTICES, 'transformed_cube': combined_matrix @ CUBE_VERTICES}
+
+def plot(result=None):
+    """Original and transformed cube side by side; returns the figure"""
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+    result = result or solve()
+
+    fig = plt.figure(figsize=(12, 6))
 
-# Plotting
-fig = plt.figure(figsize=(12, 6))
+    # Original cube
+    ax1 = fig.add_subplot(121, projection='3d')
+    ax1.set_title('Original Cube')
+    ax1.add_collection3d(Poly3DCollection(get_faces(result['cube']), facecolors='skyblue', edgecolors='black', alpha=0.6))
+    ax1.set_xlim([-5, 5])
+    ax1.set_ylim([-5, 5])
+    ax1.set_zlim([-5, 5])
+    ax1.set_xlabel("X")
+    ax1.set_ylabel("Y")
+    ax1.set_zlabel("Z")
+    ax1.view_init(elev=20, azim=30)
 
-# Original cube
-ax1 = fig.add_subplot(121, projection='3d')
-ax1.set_title('Original Cube')
-ax1.add_collection3d(Poly3DCollection(get_faces(cube_vertices), facecolors='skyblue', edgecolors='black', alpha=0.6))
-ax1.set_xlim([-5, 5])
-ax1.set_ylim([-5, 5])
-ax1.set_zlim([-5, 5])
-ax1.set_xlabel("X")
-ax1.set_ylabel("Y")
-ax1.set_zlabel("Z")
-ax1.view_init(elev=20, azim=30)
+    # Transformed cube
+    ax2 = fig.add_subplot(122, projection='3d')
+    ax2.set_title('Transformed Cube (Scale → Rotate → Translate)')
+    ax2.add_collection3d(Poly3DCollection(get_faces(result['transformed_cube']), facecolors='orange', edgecolors='black', alpha=0.6))
+    ax2.set_xlim([-5, 8])
+    ax2.set_ylim([-5, 8])
+    ax2.set_zlim([-5, 8])
+    ax2.set_xlabel("X")
+    ax2.set_ylabel("Y")
+    ax2.set_zlabel("Z")
+    ax2.view_init(elev=20, azim=30)
 
-# Transformed cube
-ax2 = fig.add_subplot(122, projection='3d')
-ax2.set_title('Transformed Cube (Scale → Rotate → Translate)')
-ax2.add_collection3d(Poly3DCollection(get_faces(transformed_vertices), facecolors='orange', edgecolors='black', alpha=0.6))
-ax2.set_xlim([-5, 8])
-ax2.set_ylim([-5, 8])
-ax2.set_zlim([-5, 8])
-ax2.set_xlabel("X")
-ax2.set_ylabel("Y")
-ax2.set_zlabel("Z")
-ax2.view_init(elev=20, azim=30)
+    fig.tight_layout()
+    return fig
 
-plt.tight_layout()
-plt.show()
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    result = solve()
+    plot(result)
+    plt.show()
 
-# Output matrices for reference
-print("Scale Matrix:\n", scale_matrix)
-print("\nRotation Matrix (Z-axis, 30 degrees):\n", rotation_matrix)
-print("\nTranslation Matrix:\n", translation_matrix)
-print("\nCombined Transformation Matrix:\n", combined_matrix)
-print("\nTransformed Vertices:\n", transformed_vertices)
-# The code above demonstrates a sequence of transformations applied to a cube in 3D space.
-# The cube is first scaled by a factor of 2 in the X and Y dimensions, then rotated around the Z-axis by 30 degrees, and finally translated by 3 units in the X and 2 units in the Y dimensions.
\ No newline at end of file
+    # Output matrices for reference
+    print("Scale Matrix:\n", result['scale'])
+    print("\nRotation Matrix (Z-axis, 30 degrees):\n", result['rotation'])
+    print("\nTranslation Matrix:\n", result['translation'])
+    print("\nCombined Transformation Matrix:\n", result['combined'])
+    print("\nTransformed Vertices:\n", result['transformed_cube'])
@@ -1,33 +1,19 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+
+from transforms import look_at_matrices
 
 def calculate_view_matrix(camera_pos, target_pos, up_vector):
-    """Calculate the view matrix for camera transformation"""
-    forward = (camera_pos - target_pos) / np.linalg.norm(camera_pos - target_pos)
-    right = np.cross(up_vector, forward) / np.linalg.norm(np.cross(up_vector, forward))
-    up = np.cross(forward, right)
-    
-    rotation = np.identity(4)
-    rotation[:3, 0] = right
-    rotation[:3, 1] = up
-    rotation[:3, 2] = forward
-    
-    translation = np.identity(4)
-    translation[:3, 3] = -camera_pos
-    
-    return rotation @ translation
-
-# Define camera parameters
-camera_position = np.array([0, 1, 0])
-target_position = np.array([0, 0, 0])
-up_vector = np.array([1, 1, 0])
-
-# Calculate view matrix
-view_matrix = calculate_view_matrix(camera_position, target_position, up_vector)
-
-# Create a simple 3D object (cube vertices)
-cube_vertices = np.array([
+    """Calculate the view matrix for camera transformation.
+
+    The rows of the rotation are the camera's right, up and forward axes
+    (forward pointing from the target back to the camera), so the camera
+    looks down its -Z axis as with gluLookAt. An up vector parallel to the
+    view direction is replaced by the world axis least aligned with it.
+    """
+    return look_at_matrices(camera_pos, target_pos, up_vector)
+
+# A simple 3D object (cube vertices)
+CUBE_VERTICES = np.array([
     [-0.5, -0.5, -0.5, 1],
     [0.5, -0.5, -0.5, 1],
     [0.5, 0.5, -0.5, 1],
@@ -38,65 +24,79 @@ cube_vertices = np.array([
     [-0.5, 0.5, 0.5, 1]
 ])
 
-# Transform cube to camera space
-transformed_cube = (view_matrix @ cube_vertices.T).T
-
-# Create figure
-fig = plt.figure(figsize=(12, 6))
-
-# Plot in world coordinates
-ax1 = fig.add_subplot(121, projection='3d')
-ax1.scatter(camera_position[0], camera_position[1], camera_position[2], c='r', s=100, label='Camera')
-ax1.scatter(target_position[0], target_position[1], target_position[2], c='g', s=100, label='Target')
-ax1.quiver(*camera_position, *(target_position-camera_position), color='b', label='View Direction')
-ax1.quiver(*camera_position, *up_vector, color='y', label='Up Vector')
-
-# Plot cube in world space
-for i in range(4):
-    ax1.plot([cube_vertices[i, 0], cube_vertices[(i+1)%4, 0]],
-             [cube_vertices[i, 1], cube_vertices[(i+1)%4, 1]],
-             [cube_vertices[i, 2], cube_vertices[(i+1)%4, 2]], 'k-')
-    ax1.plot([cube_vertices[i+4, 0], cube_vertices[(i+1)%4+4, 0]],
-             [cube_vertices[i+4, 1], cube_vertices[(i+1)%4+4, 1]],
-             [cube_vertices[i+4, 2], cube_vertices[(i+1)%4+4, 2]], 'k-')
-    ax1.plot([cube_vertices[i, 0], cube_vertices[i+4, 0]],
-             [cube_vertices[i, 1], cube_vertices[i+4, 1]],
-             [cube_vertices[i, 2], cube_vertices[i+4, 2]], 'k-')
-
-ax1.set_title('World Space')
-ax1.set_xlabel('X')
-ax1.set_ylabel('Y')
-ax1.set_zlabel('Z')
-ax1.legend()
-
-# Plot in camera coordinates
-ax2 = fig.add_subplot(122, projection='3d')
-for i in range(4):
-    ax2.plot([transformed_cube[i, 0], transformed_cube[(i+1)%4, 0]],
-             [transformed_cube[i, 1], transformed_cube[(i+1)%4, 1]],
-             [transformed_cube[i, 2], transformed_cube[(i+1)%4, 2]], 'k-')
-    ax2.plot([transformed_cube[i+4, 0], transformed_cube[(i+1)%4+4, 0]],
-             [transformed_cube[i+4, 1], transformed_cube[(i+1)%4+4, 1]],
-             [transformed_cube[i+4, 2], transformed_cube[(i+1)%4+4, 2]], 'k-')
-    ax2.plot([transformed_cube[i, 0], transformed_cube[i+4, 0]],
-             [transformed_cube[i, 1], transformed_cube[i+4, 1]],
-             [transformed_cube[i, 2], transformed_cube[i+4, 2]], 'k-')
-
-ax2.scatter(0, 0, 0, c='r', s=100, label='Camera (Origin)')
-ax2.quiver(0, 0, 0, 0, 0, -1, color='b', label='View Direction (Z-axis)')
-ax2.quiver(0, 0, 0, *up_vector/np.linalg.norm(up_vector), color='y', label='Up Vector')
-
-ax2.set_title('Camera Space')
-ax2.set_xlabel('X (Right)')
-ax2.set_ylabel('Y (Up)')
-ax2.set_zlabel('Z (Forward)')
-ax2.legend()
-
-plt.tight_layout()
-plt.show()
-
-# Print results
-print("Camera Position:", camera_position)
-print("Target Position:", target_position)
-print("Up Vector:", up_vector)
-print("\nView Matrix:\n", view_matrix)
\ No newline at end of file
+def solve(camera_position=(0, 1, 0), target_position=(0, 0, 0), up_vector=(1, 1, 0)):
+    """View matrix of the camera and the cube transformed to camera space"""
+    camera_position = np.array(camera_position)
+    target_position = np.array(target_position)
+    up_vector = np.array(up_vector)
+    view_matrix = calculate_view_matrix(camera_position, target_position, up_vector)
+    return {
+        'camera_position': camera_position, 'target_position': target_position,
+        'up_vector': up_vector, 'view_matrix': view_matrix,
+        'cube': CUBE_VERTICES, 'transformed_cube': (view_matrix @ CUBE_VERTICES.T).T,
+    }
+
+def _plot_cube_edges(ax, vertices):
+    for i in range(4):
+        ax.plot([vertices[i, 0], vertices[(i+1)%4, 0]],
+                [vertices[i, 1], vertices[(i+1)%4, 1]],
+                [vertices[i, 2], vertices[(i+1)%4, 2]], 'k-')
+        ax.plot([vertices[i+4, 0], vertices[(i+1)%4+4, 0]],
+                [vertices[i+4, 1], vertices[(i+1)%4+4, 1]],
+                [vertices[i+4, 2], vertices[(i+1)%4+4, 2]], 'k-')
+        ax.plot([vertices[i, 0], vertices[i+4, 0]],
+                [vertices[i, 1], vertices[i+4, 1]],
+                [vertices[i, 2], vertices[i+4, 2]], 'k-')
+
+def plot(result=None):
+    """The cube and camera in world space and in camera space; returns the figure"""
+    import matplotlib.pyplot as plt
+    result = result or solve()
+    camera_position = result['camera_position']
+    target_position = result['target_position']
+    up_vector = result['up_vector']
+
+    fig = plt.figure(figsize=(12, 6))
+
+    # Plot in world coordinates
+    ax1 = fig.add_subplot(121, projection='3d')
+    ax1.scatter(camera_position[0], camera_position[1], camera_position[2], c='r', s=100, label='Camera')
+    ax1.scatter(target_position[0], target_position[1], target_position[2], c='g', s=100, label='Target')
+    ax1.quiver(*camera_position, *(target_position-camera_position), color='b', label='View Direction')
+    ax1.quiver(*camera_position, *up_vector, color='y', label='Up Vector')
+    _plot_cube_edges(ax1, result['cube'])
+
+    ax1.set_title('World Space')
+    ax1.set_xlabel('X')
+    ax1.set_ylabel('Y')
+    ax1.set_zlabel('Z')
+    ax1.legend()
+
+    # Plot in camera coordinates
+    ax2 = fig.add_subplot(122, projection='3d')
+    _plot_cube_edges(ax2, result['transformed_cube'])
+
+    ax2.scatter(0, 0, 0, c='r', s=100, label='Camera (Origin)')
+    ax2.quiver(0, 0, 0, 0, 0, -1, color='b', label='View Direction (Z-axis)')
+    ax2.quiver(0, 0, 0, *up_vector/np.linalg.norm(up_vector), color='y', label='Up Vector')
+
+    ax2.set_title('Camera Space')
+    ax2.set_xlabel('X (Right)')
+    ax2.set_ylabel('Y (Up)')
+    ax2.set_zlabel('Z (Forward)')
+    ax2.legend()
+
+    fig.tight_layout()
+    return fig
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    result = solve()
+    plot(result)
+    plt.show()
+
+    # Print results
+    print("Camera Position:", result['camera_position'])
+    print("Target Position:", result['target_position'])
+    print("Up Vector:", result['up_vector'])
+    print("\nView Matrix:\n", result['view_matrix'])
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 def reflect_over_line(x, y, line_slope=1, line_intercept=3):
     """
@@ -19,42 +18,58 @@ def reflect_over_line(x, y, line_slope=1, line_intercept=3):
 
     # Apply the transformation
     x_reflected = a * x + c * y + d
-    y_reflected = e * x + a * y + f
+    y_reflected = c * x + e * y + f
 
     return x_reflected, y_reflected
 
-# Original point
-x_original, y_original = 6, 0
-
-# Reflected point over y = x + 3
-x_reflected, y_reflected = reflect_over_line(x_original, y_original)
-
-# Plotting
-plt.figure(figsize=(10, 8))
-
-# Line y = x + 3
-x_vals = np.linspace(-2, 8, 100)
-y_vals = x_vals + 3
-plt.plot(x_vals, y_vals, 'g-', label='Line: y = x + 3')
-
-# Plot original and reflected points
-plt.scatter(x_original, y_original, color='blue', s=100, label=f'Original: ({x_original}, {y_original})')
-plt.scatter(x_reflected, y_reflected, color='red', s=100, label=f'Reflected: ({x_reflected:.1f}, {y_reflected:.1f})')
-
-# Draw a dashed line between the two points
-plt.plot([x_original, x_reflected], [y_original, y_reflected], 'k--', alpha=0.6)
-
-# Decorations
-plt.xlabel("X-axis")
-plt.ylabel("Y-axis")
-plt.title("Reflection of a Point Over Line y = x + 3")
-plt.axhline(0, color='black', linewidth=0.5)
-plt.axvline(0, color='black', linewidth=0.5)
-plt.grid(True)
-plt.axis('equal')
-plt.legend()
-plt.show()
-
-# Print coordinates
-print(f"Original point: ({x_original}, {y_original})")
-print(f"Reflected point: ({x_reflected:.1f}, {y_reflected:.1f})")
\ No newline at end of file
+def solve(point=(6, 0), line_slope=1, line_intercept=3):
+    """Reflection of point over y = line_slope * x + line_intercept"""
+    reflected = reflect_over_line(*point, line_slope, line_intercept)
+    return {'point': tuple(point), 'reflected': reflected,
+            'line_slope': line_slope, 'line_intercept': line_intercept}
+
+def plot(result=None):
+    """The line, the point and its reflection; returns the figure"""
+    import matplotlib.pyplot as plt
+    result = result or solve()
+    x_original, y_original = result['point']
+    x_reflected, y_reflected = result['reflected']
+    m, b = result['line_slope'], result['line_intercept']
+
+    fig = plt.figure(figsize=(10, 8))
+
+    # Line y = mx + b
+    x_vals = np.linspace(-2, 8, 100)
+    y_vals = m * x_vals + b
+    plt.plot(x_vals, y_vals, 'g-', label=f'Line: y = {m:g}x + {b:g}')
+
+    # Plot original and reflected points
+    plt.scatter(x_original, y_original, color='blue', s=100, label=f'Original: ({x_original}, {y_original})')
+    plt.scatter(x_reflected, y_reflected, color='red', s=100, label=f'Reflected: ({x_reflected:.1f}, {y_reflected:.1f})')
+
+    # Draw a dashed line between the two points
+    plt.plot([x_original, x_reflected], [y_original, y_reflected], 'k--', alpha=0.6)
+
+    # Decorations
+    plt.xlabel("X-axis")
+    plt.ylabel("Y-axis")
+    plt.title(f"Reflection of a Point Over Line y = {m:g}x + {b:g}")
+    plt.axhline(0, color='black', linewidth=0.5)
+    plt.axvline(0, color='black', linewidth=0.5)
+    plt.grid(True)
+    plt.axis('equal')
+    plt.legend()
+    return fig
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    # Reflect (6, 0) over y = x + 3
+    result = solve((6, 0))
+    plot(result)
+    plt.show()
+
+    # Print coordinates
+    x_original, y_original = result['point']
+    x_reflected, y_reflected = result['reflected']
+    print(f"Original point: ({x_original}, {y_original})")
+    print(f"Reflected point: ({x_reflected:.1f}, {y_reflected:.1f})")
@@ -1,9 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
 # Define vertices of a unit cube centered at origin
-cube_vertices = np.array([
+CUBE_VERTICES = np.array([
     [-1, -1, -1, 1],
     [ 1, -1, -1, 1],
     [ 1,  1, -1, 1],
@@ -15,7 +13,7 @@ cube_vertices = np.array([
 ]).T  # shape (4, 8)
 
 # Define cube faces using vertex indices
-faces = [
+FACES = [
     [0, 1, 2, 3],  # bottom
     [4, 5, 6, 7],  # top
     [0, 1, 5, 4],  # front
@@ -24,60 +22,76 @@ faces = [
     [0, 3, 7, 4]   # left
 ]
 
-# Define rotation matrix around Y-axis (45 degrees)
-theta = np.radians(45)
-cos_t = np.cos(theta)
-sin_t = np.sin(theta)
+# Define rotation matrix around Y-axis
+def rotation_matrix_y(degrees=45):
+    theta = np.radians(degrees)
+    cos_t = np.cos(theta)
+    sin_t = np.sin(theta)
 
-rotation_matrix_y = np.array([
-    [ cos_t, 0, sin_t, 0],
-    [     0, 1,     0, 0],
-    [-sin_t, 0, cos_t, 0],
-    [     0, 0,     0, 1]
-])
-
-# Apply rotation
-rotated_vertices = rotation_matrix_y @ cube_vertices
+    return np.array([
+        [ cos_t, 0, sin_t, 0],
+        [     0, 1,     0, 0],
+        [-sin_t, 0, cos_t, 0],
+        [     0, 0,     0, 1]
+    ])
 
 # Function to extract face vertices
 def get_faces(verts):
-    return [[verts[:3, i] for i in face] for face in faces]
+    return [[verts[:3, i] for i in face] for face in FACES]
+
+def solve(degrees=45):
+    """The cube (as columns) before and after rotating around the Y-axis"""
+    R = rotation_matrix_y(degrees)
+    return {'rotation': R, 'cube': CUBE_VERTICES,
+            'rotated_cube': R @ CUBE_VERTICES}
+
+def plot(result=None):
+    """Original and rotated cube side by side; returns the figure"""
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+    result = result or solve()
+
+    fig = plt.figure(figsize=(12, 6))
 
-# Plotting
-fig = plt.figure(figsize=(12, 6))
+    # Original cube
+    ax1 = fig.add_subplot(121, projection='3d')
+    ax1.set_title('Original Cube')
+    ax1.add_collection3d(Poly3DCollection(get_faces(result['cube']), facecolors='cyan', edgecolors='black', alpha=0.6))
+    ax1.set_xlim([-3, 3])
+    ax1.set_ylim([-3, 3])
+    ax1.set_zlim([-3, 3])
+    ax1.set_xlabel("X")
+    ax1.set_ylabel("Y")
+    ax1.set_zlabel("Z")
+    ax1.view_init(elev=20, azim=30)
 
-# Original cube
-ax1 = fig.add_subplot(121, projection='3d')
-ax1.set_title('Original Cube')
-ax1.add_collection3d(Poly3DCollection(get_faces(cube_vertices), facecolors='cyan', edgecolors='black', alpha=0.6))
-ax1.set_xlim([-3, 3])
-ax1.set_ylim([-3, 3])
-ax1.set_zlim([-3, 3])
-ax1.set_xlabel("X")
-ax1.set_ylabel("Y")
-ax1.set_zlabel("Z")
-ax1.view_init(elev=20, azim=30)
+    # Rotated cube
+    ax2 = fig.add_subplot(122, projection='3d')
+    ax2.set_title('Rotated Cube (45° around Y-axis)')
+    ax2.add_collection3d(Poly3DCollection(get_faces(result['rotated_cube']), facecolors='orange', edgecolors='black', alpha=0.6))
+    ax2.set_xlim([-3, 3])
+    ax2.set_ylim([-3, 3])
+    ax2.set_zlim([-3, 3])
+    ax2.set_xlabel("X")
+    ax2.set_ylabel("Y")
+    ax2.set_zlabel("Z")
+    ax2.view_init(elev=20, azim=30)
 
-# Rotated cube
-ax2 = fig.add_subplot(122, projection='3d')
-ax2.set_title('Rotated Cube (45° around Y-axis)')
-ax2.add_collection3d(Poly3DCollection(get_faces(rotated_vertices), facecolors='orange', edgecolors='black', alpha=0.6))
-ax2.set_xlim([-3, 3])
-ax2.set_ylim([-3, 3])
-ax2.set_zlim([-3, 3])
-ax2.set_xlabel("X")
-ax2.set_ylabel("Y")
-ax2.set_zlabel("Z")
-ax2.view_init(elev=20, azim=30)
+    fig.tight_layout()
+    return fig
 
-plt.tight_layout()
-plt.show()
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    result = solve()
+    plot(result)
+    plt.show()
 
-# Print matrix and one vertex comparison
-print("Rotation Matrix (Y-axis, 45 degrees):")
-print(rotation_matrix_y)
+    # Print matrix and one vertex comparison
+    rotated_vertices = result['rotated_cube']
+    print("Rotation Matrix (Y-axis, 45 degrees):")
+    print(result['rotation'])
 
-print("\nOriginal Vertex [0]:", cube_vertices[:3, 0])
-print("Rotated Vertex [0]:", rotated_vertices[:3, 0])
-print("Rotated Vertex [0] (homogeneous):", rotated_vertices[:, 0])
-print("Rotated Vertex [0] (non-homogeneous):", rotated_vertices[:3, 0] / rotated_vertices[3, 0])
\ No newline at end of file
+    print("\nOriginal Vertex [0]:", result['cube'][:3, 0])
+    print("Rotated Vertex [0]:", rotated_vertices[:3, 0])
+    print("Rotated Vertex [0] (homogeneous):", rotated_vertices[:, 0])
+    print("Rotated Vertex [0] (non-homogeneous):", rotated_vertices[:3, 0] / rotated_vertices[3, 0])
@@ -0,0 +1,93 @@
+"""View-frustum culling of transformed cube instances.
+
+Each instance is a 4x4 model matrix applied to the cube [-h, h]^3 that
+draw_cube_matrix draws (h = 1). Its bounds are derived straight from the
+matrix and tested against the six planes of projection @ view in one
+vectorized pass, so only instances that may be on screen get drawn:
+
+    planes = frustum_planes(perspective_matrix(45, 1.5, 0.1, 50) @ view)
+    visible = matrices[instances_visible(planes, matrices)]
+"""
+import numpy as np
+
+def frustum_planes(clip):
+    """(6, 4) planes (a, b, c, d) of a projection @ view matrix.
+
+    Ordered left, right, bottom, top, near, far, with unit normals pointing
+    into the frustum, so a*x + b*y + c*z + d is the signed distance of a
+    world-space point from each plane.
+    """
+    clip = np.asarray(clip, dtype=float)
+    w = clip[3]
+    planes = np.stack([w + clip[0], w - clip[0], w + clip[1], w - clip[1], w + clip[2], w - clip[2]])
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+# Corner directions (x = +h only: opposite corners are equally far) as columns
+_CORNER_SIGNS = np.array([[1, 1, 1, 1], [1, 1, -1, -1], [1, -1, 1, -1]])
+
+def _float_matrices(matrices):
+    matrices = np.asarray(matrices)
+    if matrices.dtype.kind != 'f':
+        matrices = matrices.astype(np.float64)
+    return np.ascontiguousarray(matrices).reshape(-1, 4, 4)
+
+def bounding_spheres(matrices, half_size=1.0):
+    """Centers (N, 3) and radii (N,) of spheres around each transformed cube.
+
+    The sphere is centered on the instance origin and reaches its farthest
+    transformed corner. Opposite corners are equally far, so only the four
+    corners with x = +h are checked.
+    """
+    matrices = _float_matrices(matrices)
+    corners = matrices[:, :3, :3] @ _CORNER_SIGNS.astype(matrices.dtype)
+    radii_sq = np.einsum('nik,nik->nk', corners, corners).max(axis=1)
+    return matrices[:, :3, 3], half_size * np.sqrt(radii_sq)
+
+def bounding_boxes(matrices, half_size=1.0):
+    """Centers (N, 3) and half extents (N, 3) of each transformed cube's AABB"""
+    matrices = _float_matrices(matrices)
+    extents = half_size * np.abs(matrices[:, :3, :3]).sum(axis=2)
+    return matrices[:, :3, 3], extents
+
+def spheres_visible(planes, centers, radii):
+    """(N,) mask of spheres not entirely behind any frustum plane"""
+    distances = centers @ planes[:, :3].T + planes[:, 3]
+    return np.all(distances >= -radii[:, None], axis=1)
+
+def boxes_visible(planes, centers, extents):
+    """(N,) mask of AABBs not entirely behind any frustum plane"""
+    distances = centers @ planes[:, :3].T + planes[:, 3]
+    reach = extents @ np.abs(planes[:, :3]).T
+    return np.all(distances >= -reach, axis=1)
+
+def instances_visible(planes, matrices, half_size=1.0):
+    """(N,) mask of cube instances that may intersect the frustum.
+
+    Both bounds enclose the cube, so an instance behind a plane by more
+    than either bound's reach is outside the frustum; the smaller reach
+    per plane tests both at once. Plane distances, box reaches and corner
+    offsets are all linear in the 16 matrix entries, so each is a single
+    (k, 16) @ (16, N) product in the matrices' own float dtype, laid out
+    so that every reduction runs along N.
+    """
+    matrices = _float_matrices(matrices)
+    dtype = matrices.dtype
+    entries = matrices.reshape(-1, 16).T               # (16, N) view
+    planes = np.asarray(planes, dtype=dtype)
+    # Weights on the entries m[i, j] = entries[4 * i + j]
+    to_distance = np.zeros((6, 16), dtype=dtype)
+    to_distance[:, [3, 7, 11]] = planes[:, :3]
+    to_reach = np.zeros((6, 16), dtype=dtype)
+    to_corners = np.zeros((12, 16), dtype=dtype)
+    for i in range(3):
+        to_reach[:, 4 * i:4 * i + 3] = half_size * np.abs(planes[:, i, None])
+        to_corners[4 * i:4 * i + 4, 4 * i:4 * i + 3] = half_size * _CORNER_SIGNS.T
+    distances = to_distance @ entries                   # (6, N)
+    distances += planes[:, 3, None]
+    reach = to_reach @ np.abs(entries)                  # (6, N)
+    corners = to_corners @ entries                      # (xyz * 4 corners, N)
+    corners *= corners
+    radii = np.sqrt(corners.reshape(3, 4, -1).sum(axis=0).max(axis=0))
+    np.minimum(reach, radii, out=reach)
+    distances += reach
+    return distances.min(axis=0) >= 0
@@ -0,0 +1,149 @@
+"""Per-phase frame timing for the interactive loop in main.py.
+
+FrameTimer splits each frame into named phases with time.perf_counter_ns
+and keeps the last `window` frames of every question in a ring buffer, so
+rolling p50/p95/p99 frame times are available at any point:
+
+    timer = FrameTimer(('events', 'draw', 'flip'))
+    timer.begin_frame()
+    ...; timer.mark('events')
+    ...; timer.mark('draw')
+    ...; timer.mark('flip')
+    timer.end_frame(question)
+    timer.export('frames.csv')      # or .json
+
+Recording a frame costs one perf_counter_ns call per phase and a row write;
+percentiles are only computed when they are asked for.
+
+StartupProfile records the one-off milestones before the first frame, each
+checked against an optional budget.
+"""
+import csv
+import json
+from time import perf_counter_ns
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+class FrameTimer:
+    def __init__(self, phases, window=600):
+        self.phases = tuple(phases)
+        self.window = window
+        self._column = {name: i for i, name in enumerate(self.phases)}
+        self._samples = {}     # question -> (window, phases) int64 ns ring buffer
+        self._counts = {}      # question -> frames recorded so far
+        self._row = np.zeros(len(self.phases), dtype=np.int64)
+        self._in_frame = False
+        self._last = 0
+
+    def begin_frame(self):
+        self._in_frame = True
+        self._row[:] = 0
+        self._last = perf_counter_ns()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to phase"""
+        now = perf_counter_ns()
+        self._row[self._column[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self, question):
+        """Record the frame in progress under question"""
+        if not self._in_frame:
+            return
+        if question not in self._samples:
+            self._samples[question] = np.zeros((self.window, len(self.phases)), dtype=np.int64)
+            self._counts[question] = 0
+        self._samples[question][self._counts[question] % self.window] = self._row
+        self._counts[question] += 1
+        self._in_frame = False
+
+    def cancel_frame(self):
+        """Drop the frame in progress, e.g. when nothing was drawn"""
+        self._in_frame = False
+
+    def questions(self):
+        return sorted(self._samples)
+
+    def frames(self, question):
+        """(n, phases) nanosecond samples of the last n <= window frames"""
+        return self._samples[question][:min(self._counts[question], self.window)]
+
+    def percentiles(self, question):
+        """{phase or 'total': (p50, p95, p99)} in milliseconds"""
+        samples = self.frames(question)
+        columns = dict(zip(self.phases, samples.T))
+        columns['total'] = samples.sum(axis=1)
+        return {name: tuple(np.percentile(values, PERCENTILES) / 1e6)
+                for name, values in columns.items()}
+
+    # --------- Export ---------
+    def summary(self):
+        """One record per question and phase (plus 'total'), times in ms"""
+        records = []
+        for q in self.questions():
+            count = min(self._counts[q], self.window)
+            for name, values in self.percentiles(q).items():
+                record = {'question': q, 'phase': name, 'frames': count}
+                record.update({f'p{p}_ms': round(float(v), 4) for p, v in zip(PERCENTILES, values)})
+                records.append(record)
+        return records
+
+    def export(self, path):
+        """Write summary() as CSV or JSON, chosen by the file extension"""
+        records = self.summary()
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.json'):
+                json.dump(records, f, indent=2)
+            else:
+                fields = ['question', 'phase', 'frames'] + [f'p{p}_ms' for p in PERCENTILES]
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(records)
+
+    def report_lines(self, question):
+        """Text lines for an on-screen overlay"""
+        if question not in self._samples:
+            return [f"Q{question}: no frames yet"]
+        lines = [f"Q{question} {min(self._counts[question], self.window)} frames   p50 / p95 / p99 ms"]
+        for name, values in self.percentiles(question).items():
+            lines.append(f"{name:>8} " + " / ".join(f"{v:6.2f}" for v in values))
+        return lines
+
+# --------- Startup ---------
+class StartupProfile:
+    """Wall-clock milestones of application startup.
+
+    mark(phase) charges the time since the previous mark to phase; budgets
+    maps a phase to the time in ms from `start` by which it should be done:
+
+        profile = StartupProfile(start_ns, budgets={'window': 500})
+        ...; profile.mark('window')
+        print('\\n'.join(profile.report_lines()))
+    """
+    def __init__(self, start_ns=None, budgets=None):
+        self.start_ns = perf_counter_ns() if start_ns is None else start_ns
+        self.budgets = dict(budgets or {})
+        self.phases = []       # (phase, ms, ms since start)
+        self._last = self.start_ns
+
+    def mark(self, phase):
+        now = perf_counter_ns()
+        self.phases.append((phase, (now - self._last) / 1e6, (now - self.start_ns) / 1e6))
+        self._last = now
+
+    def over_budget(self):
+        """(phase, ms since start, budget ms) of every phase that missed its budget"""
+        return [(phase, elapsed, self.budgets[phase]) for phase, _, elapsed in self.phases
+                if phase in self.budgets and elapsed > self.budgets[phase]]
+
+    def report_lines(self):
+        lines = [f"{'phase':>12} {'ms':>8} {'since start':>12}"]
+        for phase, ms, elapsed in self.phases:
+            line = f"{phase:>12} {ms:8.1f} {elapsed:12.1f}"
+            if phase in self.budgets:
+                budget = self.budgets[phase]
+                line += f"   budget {budget:g}" + ("  OVER" if elapsed > budget else "")
+            lines.append(line)
+        return lines
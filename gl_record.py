@@ -0,0 +1,241 @@
+"""Recording and tracing backends for the OpenGL calls made by main.py and utils.py.
+
+GLRecorder swaps every gl*/glu* function that a module pulled in through
+`from OpenGL.GL import *` for a stub that only counts calls and vertices, so
+`main.draw_question` can run (and be timed) without a window or a GPU.
+GLTracer instead wraps the real functions, adding per-frame call, vertex and
+time accounting to a live session (`python main.py --trace-gl gl.json`).
+
+    python gl_record.py --frames 5000
+    python gl_record.py --save baseline.json
+    python gl_record.py --compare baseline.json
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+# Functions that submit vertices, mapped to how many each call submits
+_VERTEX_CALLS = {
+    'glVertex2f': lambda args: 1,
+    'glVertex2fv': lambda args: 1,
+    'glVertex3f': lambda args: 1,
+    'glVertex3fv': lambda args: 1,
+    'glDrawArrays': lambda args: args[2],
+    'glDrawElements': lambda args: args[1],
+}
+
+def _is_gl_function(name, value):
+    return name.startswith('gl') and callable(value)
+
+class GLBackend:
+    """Base for objects that stand in for the gl* functions of some modules.
+
+    Subclasses implement _stub(name, original), returning the replacement
+    for the function `original` installed under `name`. The stubs made for
+    a module are kept, so installing the same backend again only swaps the
+    names back in.
+    """
+
+    def __init__(self):
+        self._saved = []      # (module, {name: original}) currently replaced
+        self._stubs = {}      # module -> ({name: original}, {name: stub})
+
+    def _stub(self, name, original):
+        raise NotImplementedError
+
+    def install(self, *modules):
+        for module in modules:
+            namespace = vars(module)
+            originals, stubs = self._stubs.get(module, ({}, {}))
+            if not originals or any(namespace.get(name) is not value for name, value in originals.items()):
+                originals = {name: value for name, value in namespace.items()
+                             if _is_gl_function(name, value)}
+                stubs = {name: self._stub(name, value) for name, value in originals.items()}
+                self._stubs[module] = (originals, stubs)
+            self._saved.append((module, originals))
+            namespace.update(stubs)
+        return self
+
+    @property
+    def installed(self):
+        return bool(self._saved)
+
+    def uninstall(self):
+        for module, originals in reversed(self._saved):
+            vars(module).update(originals)
+        self._saved.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+class GLRecorder(GLBackend):
+    """Counts GL calls and submitted vertices instead of executing them"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+        self.vertices = 0
+
+    def reset(self):
+        self.calls.clear()
+        self.vertices = 0
+
+    def _stub(self, name, original):
+        calls = self.calls
+        count_vertices = _VERTEX_CALLS.get(name)
+        if count_vertices is None:
+            def stub(*args):
+                calls[name] += 1
+        else:
+            def stub(*args):
+                calls[name] += 1
+                self.vertices += count_vertices(args)
+        stub.__name__ = name
+        return stub
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+class GLTracer(GLBackend):
+    """Calls through to the real GL functions, counting calls, vertices and time.
+
+    Counts accumulate between begin_frame() and end_frame(question), which
+    adds them to that question's totals; summary() averages them per frame.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+        self.time_ns = Counter()
+        self.vertices = 0
+        self._totals = {}     # question -> [frames, calls Counter, time_ns Counter, vertices]
+
+    def begin_frame(self):
+        self.calls.clear()
+        self.time_ns.clear()
+        self.vertices = 0
+
+    def end_frame(self, question):
+        totals = self._totals.setdefault(question, [0, Counter(), Counter(), 0])
+        totals[0] += 1
+        totals[1].update(self.calls)
+        totals[2].update(self.time_ns)
+        totals[3] += self.vertices
+
+    def _stub(self, name, original):
+        calls, time_ns = self.calls, self.time_ns
+        count_vertices = _VERTEX_CALLS.get(name)
+        perf_counter_ns = time.perf_counter_ns
+
+        def traced(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                time_ns[name] += perf_counter_ns() - start
+                calls[name] += 1
+                if count_vertices is not None:
+                    self.vertices += count_vertices(args)
+        traced.__name__ = name
+        return traced
+
+    def summary(self):
+        """Per-frame averages for each traced question, in the benchmark_questions format"""
+        results = {}
+        for q, (frames, calls, time_ns, vertices) in sorted(self._totals.items()):
+            results[q] = {
+                'calls': sum(calls.values()) / frames,
+                'vertices': vertices / frames,
+                'ms_per_frame': sum(time_ns.values()) / frames / 1e6,
+                'by_function': Counter({name: n / frames for name, n in calls.items()}),
+                'frames': frames,
+            }
+        return results
+
+# --------- Per-question frame benchmark ---------
+def benchmark_questions(frames=2000, questions=range(1, 11)):
+    """Run main.draw_question for each question under a GLRecorder.
+
+    Returns {question: {'calls', 'vertices', 'ms_per_frame', 'by_function'}}
+    with call and vertex counts per frame.
+    """
+    import main
+    import utils
+
+    results = {}
+    with GLRecorder().install(main, utils) as recorder:
+        for q in questions:
+            # One untimed frame to count calls, then the timed run
+            recorder.reset()
+            main.draw_question(q)
+            by_function = Counter(recorder.calls)
+            vertices = recorder.vertices
+            start = time.perf_counter()
+            for _ in range(frames):
+                main.draw_question(q)
+            elapsed = time.perf_counter() - start
+            results[q] = {
+                'calls': sum(by_function.values()),
+                'vertices': vertices,
+                'ms_per_frame': 1000.0 * elapsed / frames,
+                'by_function': by_function,
+            }
+    return results
+
+def format_report(results):
+    lines = [f"{'Q':>3} {'calls':>7} {'verts':>7} {'ms/frame':>9}  top calls"]
+    for q, r in results.items():
+        top = ', '.join(f"{name}={n:g}" for name, n in r['by_function'].most_common(3))
+        lines.append(f"{q:>3} {r['calls']:>7g} {r['vertices']:>7g} {r['ms_per_frame']:>9.4f}  {top}")
+    return '\n'.join(lines)
+
+# --------- Saved profiles and regression checks ---------
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump({str(q): r for q, r in results.items()}, f, indent=2)
+
+def load_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {int(q): dict(r, by_function=Counter(r['by_function'])) for q, r in data.items()}
+
+def find_regressions(baseline, current, ratio=1.5):
+    """Messages for every question whose call or vertex counts grew by more than ratio.
+
+    Time is not compared since it depends on the machine; counts do not.
+    """
+    messages = []
+    for q, base in baseline.items():
+        if q not in current:
+            continue
+        now = current[q]
+        checks = [('calls', base['calls'], now['calls']), ('vertices', base['vertices'], now['vertices'])]
+        checks += [(name, n, now['by_function'].get(name, 0)) for name, n in base['by_function'].items()]
+        checks += [(name, 0, n) for name, n in now['by_function'].items() if name not in base['by_function']]
+        for what, before, after in checks:
+            if after > before * ratio:
+                messages.append(f"Q{q}: {what} per frame {before:g} -> {after:g}")
+    return messages
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-question GL cost profile without a GPU")
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--save', metavar='PATH', help="write the profile as JSON")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="fail if call or vertex counts grew past --ratio times a saved profile")
+    parser.add_argument('--ratio', type=float, default=1.5)
+    args = parser.parse_args()
+    results = benchmark_questions(args.frames)
+    print(format_report(results))
+    if args.save:
+        save_results(results, args.save)
+    if args.compare:
+        regressions = find_regressions(load_results(args.compare), results, args.ratio)
+        print('\n'.join(regressions) or "no regressions")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,112 @@
+"""Screen-space level of detail for tessellated primitives.
+
+The bounding sphere of an object is projected with the current modelview
+and projection matrices to a radius in pixels, and an LODSelector picks
+the coarsest tessellation of its ladder whose segments stay below
+`segment_pixels` on screen:
+
+    selector = LODSelector(LODLadder.for_sphere())
+    selector.begin_frame()
+    r = projected_radius((0, 0, 0), 1.0, modelview, projection, viewport_height)
+    slices, stacks = selector.select('planet', r)
+
+Once an object has a level it keeps it until the radius moves `hysteresis`
+(as a fraction) past that level's bounds, so objects hovering around a
+threshold don't pop back and forth. A vertex budget caps what a frame
+submits: when it runs out, later objects drop to coarser levels.
+"""
+import math
+
+import numpy as np
+
+def projected_radius(center, radius, modelview, projection, viewport_height):
+    """Radius in pixels of a sphere (object space) seen through row-major matrices.
+
+    Infinite when the eye is inside the sphere, zero when it is behind
+    the eye.
+    """
+    modelview = np.asarray(modelview, dtype=float)
+    projection = np.asarray(projection, dtype=float)
+    eye_center = modelview @ np.append(np.asarray(center, dtype=float), 1.0)
+    # The largest axis scale of the modelview bounds the eye-space radius
+    eye_radius = radius * np.sqrt((modelview[:3, :3] ** 2).sum(axis=0).max())
+    distance = -eye_center[2]
+    w = projection[3] @ eye_center
+    perspective = projection[3, 2] != 0
+    if perspective and distance <= eye_radius:
+        return math.inf if distance > -eye_radius else 0.0
+    if w <= 0:
+        return 0.0
+    return eye_radius * abs(projection[1, 1]) * viewport_height / 2 / w
+
+class LODLadder:
+    """Tessellation levels from coarse to fine with their vertex counts.
+
+    `levels` are the parameters passed to the mesh builder, `segments` the
+    number of segments around each level's silhouette and `vertices` its
+    vertex count.
+    """
+    def __init__(self, levels, segments, vertices):
+        if not len(levels) == len(segments) == len(vertices):
+            raise ValueError("levels, segments and vertices must have the same length")
+        if list(segments) != sorted(segments):
+            raise ValueError("levels must be ordered from coarse to fine")
+        self.levels = tuple(levels)
+        self.segments = np.asarray(segments, dtype=float)
+        self.vertices = tuple(vertices)
+
+    @classmethod
+    def for_sphere(cls, slices=(8, 12, 16, 24, 32, 48, 64, 96, 128)):
+        """(slices, stacks) levels for utils.sphere_mesh, stacks = slices / 2 but at least 4"""
+        levels = [(s, max(4, s // 2)) for s in slices]
+        return cls(levels, slices, [(s + 1) * (t + 1) for s, t in levels])
+
+    @classmethod
+    def for_cylinder(cls, slices=(8, 12, 16, 24, 32, 48, 64, 96, 128)):
+        """slices levels for utils.cylinder_mesh"""
+        return cls(tuple(slices), slices, [4 * (s + 1) + 2 for s in slices])
+
+    def __len__(self):
+        return len(self.levels)
+
+class LODSelector:
+    def __init__(self, ladder, segment_pixels=4.0, hysteresis=0.15, vertex_budget=None):
+        self.ladder = ladder
+        self.hysteresis = hysteresis
+        self.vertex_budget = vertex_budget
+        # Largest pixel radius each level covers: its silhouette segments
+        # (2 pi r / segments) stay within segment_pixels up to this radius
+        self.limits = ladder.segments * segment_pixels / (2 * np.pi)
+        self.vertices_used = 0
+        self._current = {}     # object key -> level index it was last drawn at
+
+    def begin_frame(self):
+        self.vertices_used = 0
+
+    def level_index(self, pixel_radius):
+        """Coarsest level fine enough for pixel_radius, ignoring hysteresis and budget"""
+        return min(int(np.searchsorted(self.limits, pixel_radius)), len(self.limits) - 1)
+
+    def select(self, key, pixel_radius):
+        """Level for object key at pixel_radius, charged to this frame's budget"""
+        index = self.level_index(pixel_radius)
+        current = self._current.get(key)
+        if current is not None and index != current:
+            low = self.limits[current - 1] * (1 - self.hysteresis) if current else 0.0
+            high = self.limits[current] * (1 + self.hysteresis)
+            if low <= pixel_radius <= high:
+                index = current
+        self._current[key] = index
+        if self.vertex_budget is not None:
+            vertices = self.ladder.vertices
+            while index > 0 and self.vertices_used + vertices[index] > self.vertex_budget:
+                index -= 1
+        self.vertices_used += self.ladder.vertices[index]
+        return self.ladder.levels[index]
+
+    def forget(self, key=None):
+        """Drop the remembered level of key, or of every object"""
+        if key is None:
+            self._current.clear()
+        else:
+            self._current.pop(key, None)
@@ -1,9 +1,42 @@
+import argparse
+import sys
+from time import perf_counter_ns
+_start_ns = perf_counter_ns()   # Reference point of --startup-profile
+
 import pygame
 from pygame.locals import *
-from OpenGL.GL import *
-from OpenGL.GLU import *
 import numpy as np
-from math import sin, cos, radians, pi
+from functools import lru_cache
+
+from culling import frustum_planes, instances_visible
+from frame_timing import FrameTimer, StartupProfile
+from scene_state import SceneState
+from transforms import (
+    IDENTITY, _frozen, angle_directions, clock_points, column_major, look_at_matrices,
+    perspective_matrix, question_matrix, stretch_points,
+)
+
+# --------- Deferred OpenGL import ---------
+# Importing OpenGL.GL takes longer than opening the window, so when main.py is
+# run as a script main() binds the GL names only once the window is up.
+# Imported as a module, main binds them straight away like a star import.
+_gl_loaded = False
+
+def load_gl():
+    """Bind every public OpenGL.GL name into this module, as `from OpenGL.GL import *` does.
+
+    utils imports OpenGL.GL itself, so it is imported here too.
+    """
+    global _gl_loaded, utils
+    if not _gl_loaded:
+        import OpenGL.GL
+        import utils
+        globals().update((name, value) for name, value in vars(OpenGL.GL).items()
+                         if not name.startswith('_'))
+        _gl_loaded = True
+
+if __name__ != "__main__":
+    load_gl()
 
 # --------- Draw coordinate axes ---------
 def draw_axes():
@@ -21,20 +54,8 @@ def draw_axes():
 
 # --------- Draw a cube ---------
 def draw_cube(size=1.0):
-    hs = size / 2.0
-    vertices = [
-        [ hs, hs, hs], [ hs,-hs, hs], [-hs,-hs, hs], [-hs, hs, hs], # front
-        [ hs, hs,-hs], [ hs,-hs,-hs], [-hs,-hs,-hs], [-hs, hs,-hs], # back
-    ]
-    faces = [
-        [0,1,2,3], [4,5,6,7], [0,4,5,1],
-        [3,7,6,2], [0,4,7,3], [1,5,6,2]
-    ]
-    glBegin(GL_QUADS)
-    for face in faces:
-        for v in face:
-            glVertex3fv(vertices[v])
-    glEnd()
+    # Cached interleaved quads drawn as one vertex array
+    utils.draw_cube(size)
 
 # --------- Draw a point ---------
 def draw_point(x, y, z, color=(1,0,0)):
@@ -44,144 +65,265 @@ def draw_point(x, y, z, color=(1,0,0)):
     glVertex3f(x, y, z)
     glEnd()
 
+# --------- Indexed wireframes ---------
+# Wireframes are drawn from float32 vertex arrays and static uint32 index
+# buffers listing each unique edge once, one glDrawElements per shape.
+# Shared arrays are made read-only.
+@lru_cache(maxsize=16)
+def loop_edge_indices(n):
+    """GL_LINES indices of the closed polygon through vertices 0..n-1"""
+    i = np.arange(n, dtype=np.uint32)
+    return _frozen(np.stack([i, (i + 1) % n], axis=1).ravel())
+
+def draw_indexed_lines(vertices, indices):
+    """GL_LINES over the (n, 2 or 3) float32 vertices, in one glDrawElements"""
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(vertices.shape[1], GL_FLOAT, 0, vertices)
+    glDrawElements(GL_LINES, len(indices), GL_UNSIGNED_INT, indices)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
 # --------- Draw a square in XY plane ---------
-def draw_square(size=2.0):
+@lru_cache(maxsize=16)
+def square_vertices(size=2.0):
     hs = size / 2.0
-    glBegin(GL_LINE_LOOP)
+    return _frozen(np.array([(-hs,-hs),(hs,-hs),(hs,hs),(-hs,hs)], dtype=np.float32))
+
+def draw_square(size=2.0):
     glColor3f(1,1,1)
-    for x, y in [(-hs,-hs),(hs,-hs),(hs,hs),(-hs,hs)]:
-        glVertex3f(x, y, 0)
-    glEnd()
+    draw_indexed_lines(square_vertices(size), loop_edge_indices(4))
 
 # --------- Draw a clock (12 points on a circle) ---------
 def draw_clock(points, color=(0,0,1)):
+    points = np.asarray(points, dtype=np.float32)
     glColor3f(*color)
-    glBegin(GL_LINE_LOOP)
-    for x, y in points:
-        glVertex3f(x, y, 0)
-    glEnd()
+    draw_indexed_lines(points, loop_edge_indices(len(points)))
     glPointSize(8)
-    glBegin(GL_POINTS)
-    for x, y in points:
-        glVertex3f(x, y, 0)
-    glEnd()
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(2, GL_FLOAT, 0, points)
+    glDrawArrays(GL_POINTS, 0, len(points))
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+# --------- Draw cubes using transformation matrices ---------
+# Corners of the cube [-1, 1]^3 and its 12 edges as GL_LINES corner indices
+CUBE_CORNERS = _frozen(np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float32))
+CUBE_EDGES = [(a, b) for a in range(8) for b in range(a + 1, 8) if bin(a ^ b).count('1') == 1]
+CUBE_EDGE_INDICES = _frozen(np.array(CUBE_EDGES, dtype=np.uint32).ravel())
+
+_cube_indices = CUBE_EDGE_INDICES
+
+def cube_edge_indices(n):
+    """GL_LINES indices of n cubes stored as consecutive groups of 8 corners"""
+    global _cube_indices
+    if len(_cube_indices) < 24 * n:
+        # Grow geometrically; the indices for fewer cubes are a prefix
+        count = max(n, 2 * len(_cube_indices) // 24)
+        base = np.arange(count, dtype=np.uint32)[:, None] * 8
+        _cube_indices = _frozen((base + CUBE_EDGE_INDICES).ravel())
+    return _cube_indices[:24 * n]
+
+def cube_corners(matrices, out=None):
+    """(N*8, 3) float32 corners of N transformed cubes, in one batched matmul"""
+    matrices = np.asarray(matrices, dtype=np.float32).reshape(-1, 4, 4)
+    n = len(matrices)
+    out = np.empty((n, 8, 3), dtype=np.float32) if out is None else out.reshape(n, 8, 3)
+    np.matmul(CUBE_CORNERS, matrices[:, :3, :3].swapaxes(1, 2), out=out)
+    out += matrices[:, None, :3, 3]
+    return out.reshape(-1, 3)
 
-# --------- Draw a cube using a transformation matrix ---------
 def draw_cube_matrix(matrix, color=(0.5,0.5,1)):
-    # 8 vertices of a unit cube
-    cube = np.array([
-        [-1, -1, -1, 1],
-        [ 1, -1, -1, 1],
-        [ 1,  1, -1, 1],
-        [-1,  1, -1, 1],
-        [-1, -1,  1, 1],
-        [ 1, -1,  1, 1],
-        [ 1,  1,  1, 1],
-        [-1,  1,  1, 1],
-    ])
-    # Apply transformation
-    transformed = (matrix @ cube.T).T
-    # Draw cube faces as wireframe
-    faces = [
-        [0,1,2,3], [4,5,6,7], [0,1,5,4],
-        [2,3,7,6], [1,2,6,5], [0,3,7,4]
-    ]
-    glColor3f(*color)
-    for face in faces:
-        glBegin(GL_LINE_LOOP)
-        for idx in face:
-            glVertex3fv(transformed[idx][:3])
-        glEnd()
+    draw_cube_matrices(matrix, color)
+
+# Culling only pays off for large batches with many cubes off screen; below
+# this size testing costs more than drawing everything
+CULL_MIN_INSTANCES = 1000
+
+def draw_cube_matrices(matrices, colors, view=None):
+    """Wireframe cubes for (N,4,4) matrices in one glDrawElements(GL_LINES) call.
+
+    colors is one (r, g, b) or one per matrix. With a view (the arguments
+    of view_frustum) and at least CULL_MIN_INSTANCES cubes, those entirely
+    outside the frustum are dropped first; the frustum is only built then.
+    """
+    matrices = np.asarray(matrices, dtype=np.float32).reshape(-1, 4, 4)
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.float32), (len(matrices), 3))
+    if view is not None and len(matrices) >= CULL_MIN_INSTANCES:
+        visible = instances_visible(view_frustum(*view), matrices)
+        if not visible.all():
+            matrices, colors = matrices[visible], colors[visible]
+    if len(matrices) == 0:
+        return
+    vertices = cube_corners(matrices)
+    indices = cube_edge_indices(len(matrices))
+    if (colors == colors[0]).all():
+        glColor3f(*colors[0])
+        draw_indexed_lines(vertices, indices)
+    else:
+        corner_colors = np.repeat(colors, 8, axis=0)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glColorPointer(3, GL_FLOAT, 0, corner_colors)
+        draw_indexed_lines(vertices, indices)
+        glDisableClientState(GL_COLOR_ARRAY)
 
 # --------- Parameters for each question ---------
-# Q1: Translation, Rotation, Scaling
-q1_translation = [0.0, 0.0, 0.0]
-q1_angle = 0.0
-q1_scale = [1.0, 1.0, 1.0]
-
-# Q2: Camera parameters
-q2_camera = [0.0, 1.0, 8.0]
-q2_look = [0.0, 0.0, 0.0]
-q2_up = [0.0, 1.0, 0.0]
-
-# Q3: Clock stretching
-q3_stretch = 1.0
-
-# Q4: Reflection
-q4_point = [3.0, 0.0]
-q4_m = 1.0
-q4_b = 3.0
-
-# Q5: Composite transform
-q5_a = 2.0
-
-# Q6: Shear, Taper, Scale, Rotate, Translate
-q6_shear = 0.5
-q6_taper = 0.2
-q6_scale = 3.0
-q6_angle = 45.0
-q6_trans = [-2, 3, 1]
-
-# Q7: Square rotate/translate
-q7_angle = 45.0
-q7_tx = 3.0
-q7_ty = 2.0
-
-# Q8: Cube scaling
-q8_sx = 2.0
-q8_sy = 1.0
-q8_sz = 0.5
-
-# Q9: Cube rotation
-q9_angle = 45.0
-
-# Q10: Scale, rotate, translate
-q10_sx = 2.0
-q10_sy = 1.5
-q10_sz = 1.0
-q10_angle = 30.0
-q10_tx = 3.0
-q10_ty = 2.0
-q10_tz = 1.0
+# All interactive state lives in one SceneState (see scene_state.py)
+scene = SceneState()
+
+def question_state(q, state=None):
+    """Hashable snapshot of the parameters question q depends on"""
+    return (state or scene).question(q).values()
+
+# --------- Keyboard controls ---------
+# (question, key) -> (field, component, step, minimum). component picks one
+# entry of a tuple field; None changes a scalar field or every entry. A key
+# press applies one step; holding the key past HOLD_DELAY keeps applying
+# REPEAT_RATE steps per second, scaled by the frame time. With --on-demand
+# the loop polls held keys at most HELD_KEY_FPS times per second.
+HOLD_DELAY = 0.3
+REPEAT_RATE = 12.0
+HELD_KEY_FPS = 60
+
+QUESTION_CONTROLS = {
+    1: {  # Q1: Move, scale, rotate
+        K_LEFT: ('translation', 0, -0.2, None), K_RIGHT: ('translation', 0, 0.2, None),
+        K_UP: ('translation', 1, 0.2, None), K_DOWN: ('translation', 1, -0.2, None),
+        K_w: ('scale', None, 0.1, None), K_s: ('scale', None, -0.1, 0.1),
+        K_a: ('angle', None, 5, None), K_d: ('angle', None, -5, None),
+    },
+    2: {  # Q2: Move camera
+        K_LEFT: ('camera', 0, -0.5, None), K_RIGHT: ('camera', 0, 0.5, None),
+        K_UP: ('camera', 1, 0.5, None), K_DOWN: ('camera', 1, -0.5, None),
+        K_w: ('camera', 2, -0.5, None), K_s: ('camera', 2, 0.5, None),
+    },
+    3: {  # Q3: Stretch clock
+        K_w: ('stretch', None, 0.1, None), K_s: ('stretch', None, -0.1, 0.1),
+    },
+    4: {  # Q4: Move point, change line
+        K_LEFT: ('point', 0, -0.2, None), K_RIGHT: ('point', 0, 0.2, None),
+        K_UP: ('point', 1, 0.2, None), K_DOWN: ('point', 1, -0.2, None),
+        K_w: ('m', None, 0.1, None), K_s: ('m', None, -0.1, None),
+        K_a: ('b', None, 0.1, None), K_d: ('b', None, -0.1, None),
+    },
+    5: {  # Q5: Change parameter a
+        K_w: ('a', None, 0.2, None), K_s: ('a', None, -0.2, 0.1),
+    },
+    6: {  # Q6: Shear and rotate
+        K_w: ('shear', None, 0.1, None), K_s: ('shear', None, -0.1, None),
+        K_a: ('angle', None, 5, None), K_d: ('angle', None, -5, None),
+    },
+    7: {  # Q7: Rotate and move square
+        K_a: ('angle', None, 5, None), K_d: ('angle', None, -5, None),
+        K_LEFT: ('tx', None, -0.2, None), K_RIGHT: ('tx', None, 0.2, None),
+        K_UP: ('ty', None, 0.2, None), K_DOWN: ('ty', None, -0.2, None),
+    },
+    8: {  # Q8: Scale cube
+        K_w: ('sx', None, 0.1, None), K_s: ('sx', None, -0.1, 0.1),
+        K_a: ('sy', None, 0.1, None), K_d: ('sy', None, -0.1, 0.1),
+        K_q: ('sz', None, 0.1, None), K_e: ('sz', None, -0.1, 0.1),
+    },
+    9: {  # Q9: Rotate cube
+        K_a: ('angle', None, 5, None), K_d: ('angle', None, -5, None),
+    },
+    10: {  # Q10: Scale, rotate, translate cube
+        K_w: ('sx', None, 0.1, None), K_s: ('sx', None, -0.1, 0.1),
+        K_a: ('sy', None, 0.1, None), K_d: ('sy', None, -0.1, 0.1),
+        K_q: ('sz', None, 0.1, None), K_e: ('sz', None, -0.1, 0.1),
+        K_LEFT: ('tx', None, -0.2, None), K_RIGHT: ('tx', None, 0.2, None),
+        K_UP: ('ty', None, 0.2, None), K_DOWN: ('ty', None, -0.2, None),
+        K_z: ('angle', None, 5, None), K_x: ('angle', None, -5, None),
+    },
+}
+KEY_ACTIONS = {(q, key): action for q, keys in QUESTION_CONTROLS.items() for key, action in keys.items()}
+QUESTION_KEYS = {q: tuple(keys.items()) for q, keys in QUESTION_CONTROLS.items()}
+
+def apply_action(p, action, steps=1.0):
+    """Change the parameter an action controls by `steps` times its step"""
+    field, component, step, minimum = action
+    def moved(x):
+        x += step * steps
+        return x if minimum is None else max(minimum, x)
+    value = getattr(p, field)
+    if isinstance(value, tuple):
+        value = tuple(moved(x) if component is None or i == component else x for i, x in enumerate(value))
+    else:
+        value = moved(value)
+    setattr(p, field, value)
+
+def apply_held_keys(state, pressed, key_down_at, start, now):
+    """Continuous changes for the keys held past HOLD_DELAY between start and now (seconds)"""
+    q = state.current_question
+    p = state.question(q)
+    for key in [key for key in key_down_at if not pressed[key]]:
+        del key_down_at[key]  # Released without a KEYUP reaching us
+    for key, action in QUESTION_KEYS[q]:
+        down = key_down_at.get(key)
+        if down is None:
+            continue
+        held = now - max(start, down + HOLD_DELAY)
+        if held > 0:
+            apply_action(p, action, held * REPEAT_RATE)
+
+# --------- Cached transformation matrices ---------
+# question_matrix is memoized in transforms.py; the camera
+# matrices are memoized here the same way. Shared arrays are read-only.
+DEFAULT_CAMERA = ((0, 2, 10), (0, 0, 0), (0, 1, 0))
+PERSPECTIVE = (45, 0.1, 50.0)   # fovy, near, far as in gluPerspective
+aspect_ratio = 1200 / 800       # Updated by init_gl
+
+def camera(q, state):
+    """(eye, center, up) that question q is viewed from"""
+    if q == 2:
+        p = state.question(2)
+        return p.camera, p.look, p.up
+    return DEFAULT_CAMERA
+
+@lru_cache(maxsize=64)
+def view_matrix(eye, center, up):
+    """Column-major float32 look-at matrix, ready for glLoadMatrixf"""
+    return _frozen(column_major(look_at_matrices(eye, center, up)))
+
+@lru_cache(maxsize=64)
+def view_frustum(aspect, eye, center, up):
+    """World-space frustum planes of the perspective projection and camera"""
+    fovy, near, far = PERSPECTIVE
+    clip = perspective_matrix(fovy, aspect, near, far) @ look_at_matrices(eye, center, up)
+    return _frozen(frustum_planes(clip))
+
+CLOCK_POINTS = _frozen(clock_points(dtype=np.float32))
+
+@lru_cache(maxsize=64)
+def stretched_clock(stretch, angle=45):
+    """Q3 clock stretched by `stretch` along the direction at `angle` degrees"""
+    return _frozen(stretch_points(CLOCK_POINTS, angle_directions(angle), stretch, dtype=np.float32)[0])
 
 # --------- Draw each question ---------
-def draw_question(q):
+def draw_question(q, state=None):
+    state = state or scene
+    p = state.question(q)
+    view = (aspect_ratio, *camera(q, state))
     glPushMatrix()
     draw_axes()
     if q == 1:
         # Q1: Translation + Rotation + Scaling
-        glTranslatef(*q1_translation)
-        glRotatef(q1_angle, 0, 0, 1)
-        glScalef(*q1_scale)
+        glTranslatef(*p.translation)
+        glRotatef(p.angle, 0, 0, 1)
+        glScalef(*p.scale)
         glColor3f(0,1,0)
         draw_cube(1)
         draw_point(0, 0, 0, (1,0,0))
     elif q == 2:
         # Q2: Camera movement
-        glLoadIdentity()
-        gluLookAt(*q2_camera, *q2_look, *q2_up)
+        glLoadMatrixf(view_matrix(p.camera, p.look, p.up))
         draw_cube(2)
     elif q == 3:
         # Q3: Clock stretching
-        points = []
-        for hour in range(12):
-            angle = radians(-hour * 30 + 90)
-            x = cos(angle)
-            y = sin(angle)
-            points.append([x, y])
-        theta = radians(45)
-        c, s = cos(theta), sin(theta)
-        stretch = np.array([
-            [1 + (q3_stretch-1)*c*c, (q3_stretch-1)*c*s],
-            [(q3_stretch-1)*c*s, 1 + (q3_stretch-1)*s*s]
-        ])
-        stretched = (stretch @ np.array(points).T).T
+        points = CLOCK_POINTS
+        stretched = stretched_clock(p.stretch)
         draw_clock(points, (0,0,1))      # Original clock (blue)
         draw_clock(stretched, (1,0,0))   # Stretched clock (red)
     elif q == 4:
         # Q4: Reflection over y=mx+b
-        m, b = q4_m, q4_b
-        x, y = q4_point
+        m, b = p.m, p.b
+        x, y = p.point
         denom = 1 + m**2
         xr = ((1-m**2)*x + 2*m*y - 2*m*b)/denom
         yr = ((m**2-1)*y + 2*m*x + 2*b)/denom
@@ -194,232 +336,242 @@ def draw_question(q):
         # Draw original and reflected points
         draw_point(x, y, 0, (1,0,0))
         draw_point(xr, yr, 0, (0,0,1))
-    elif q == 5:
+    elif q in (5, 6):
         # Q5: Composite transformation
-        def translation(dx,dy,dz):
-            return np.array([
-                [1,0,0,dx],[0,1,0,dy],[0,0,1,dz],[0,0,0,1]
-            ])
-        def rot_x(deg):
-            t = radians(deg)
-            c,s = cos(t), sin(t)
-            return np.array([
-                [1,0,0,0],[0,c,-s,0],[0,s,c,0],[0,0,0,1]
-            ])
-        def rot_y(deg):
-            t = radians(deg)
-            c,s = cos(t), sin(t)
-            return np.array([
-                [c,0,s,0],[0,1,0,0],[-s,0,c,0],[0,0,0,1]
-            ])
-        T1 = translation(0, q5_a, 0)
-        R1 = rot_x(90)
-        T2 = translation(0, 0, q5_a)
-        R2 = rot_y(90)
-        M = R2 @ T2 @ R1 @ T1
-        draw_cube_matrix(np.eye(4), (0,1,0))  # Original cube (green)
-        draw_cube_matrix(M, (1,0,0))          # Transformed cube (red)
-    elif q == 6:
         # Q6: Shear, Taper, Scale, Rotate, Translate
-        def shear_xz_by_y(f=0.5):
-            return np.array([
-                [1, f, 0, 0],[0,1,0,0],[0,f,1,0],[0,0,0,1]
-            ])
-        def taper_y_by_z(f=0.2):
-            return np.array([
-                [1,0,0,0],[0,1,f,0],[0,0,1,0],[0,0,0,1]
-            ])
-        def scale_z(f=3):
-            return np.array([
-                [1,0,0,0],[0,1,0,0],[0,0,f,0],[0,0,0,1]
-            ])
-        def rot_y(deg):
-            t = radians(deg)
-            c,s = cos(t), sin(t)
-            return np.array([
-                [c,0,s,0],[0,1,0,0],[-s,0,c,0],[0,0,0,1]
-            ])
-        def trans(dx,dy,dz):
-            return np.array([
-                [1,0,0,dx],[0,1,0,dy],[0,0,1,dz],[0,0,0,1]
-            ])
-        M = trans(*q6_trans) @ rot_y(q6_angle) @ scale_z(q6_scale) @ taper_y_by_z(q6_taper) @ shear_xz_by_y(q6_shear)
-        draw_cube_matrix(np.eye(4), (0,1,0))  # Original cube (green)
-        draw_cube_matrix(M, (1,0,0))          # Transformed cube (red)
+        M = question_matrix(q, p.values())
+        # Original cube (green) and transformed cube (red)
+        draw_cube_matrices((IDENTITY, M), ((0,1,0), (1,0,0)), view)
     elif q == 7:
         # Q7: Square rotate then translate
         glPushMatrix()
-        glTranslatef(q7_tx, q7_ty, 0)
-        glRotatef(q7_angle, 0,0,1)
+        glTranslatef(p.tx, p.ty, 0)
+        glRotatef(p.angle, 0,0,1)
         draw_square(2)
         glPopMatrix()
         draw_square(2)  # Original square
-    elif q == 8:
+    elif q in (8, 9):
         # Q8: Cube with non-uniform scaling
-        S = np.array([
-            [q8_sx,0,0,0],[0,q8_sy,0,0],[0,0,q8_sz,0],[0,0,0,1]
-        ])
-        draw_cube_matrix(np.eye(4), (0,1,0))  # Original cube (green)
-        draw_cube_matrix(S, (1,0,0))          # Scaled cube (red)
-    elif q == 9:
         # Q9: Cube rotation around Y
-        theta = radians(q9_angle)
-        c,s = cos(theta), sin(theta)
-        R = np.array([
-            [c,0,s,0],[0,1,0,0],[-s,0,c,0],[0,0,0,1]
-        ])
-        draw_cube_matrix(np.eye(4), (0,1,0))  # Original cube (green)
-        draw_cube_matrix(R, (1,0,0))          # Rotated cube (red)
+        M = question_matrix(q, p.values())
+        # Original cube (green) and scaled/rotated cube (red)
+        draw_cube_matrices((IDENTITY, M), ((0,1,0), (1,0,0)), view)
     elif q == 10:
         # Q10: Scale, rotate, translate
-        S = np.array([
-            [q10_sx,0,0,0],[0,q10_sy,0,0],[0,0,q10_sz,0],[0,0,0,1]
-        ])
-        theta = radians(q10_angle)
-        c,s = cos(theta), sin(theta)
-        R = np.array([
-            [c,-s,0,0],[s,c,0,0],[0,0,1,0],[0,0,0,1]
-        ])
-        T = np.array([
-            [1,0,0,q10_tx],[0,1,0,q10_ty],[0,0,1,q10_tz],[0,0,0,1]
-        ])
-        M = T @ R @ S
-        draw_cube_matrix(np.eye(4), (0,1,0))      # Original cube (green)
-        draw_cube_matrix(M, (1,0.5,0))            # Transformed cube (orange)
+        M = question_matrix(q, p.values())
+        # Original cube (green) and transformed cube (orange)
+        draw_cube_matrices((IDENTITY, M), ((0,1,0), (1,0.5,0)), view)
     glPopMatrix()
 
-def main():
-    # Make all parameter variables global so they can be modified inside the loop
-    global q1_translation, q1_angle, q1_scale
-    global q2_camera, q2_look, q2_up
-    global q3_stretch
-    global q4_point, q4_m, q4_b
-    global q5_a
-    global q6_shear, q6_taper, q6_scale, q6_angle, q6_trans
-    global q7_angle, q7_tx, q7_ty
-    global q8_sx, q8_sy, q8_sz
-    global q9_angle
-    global q10_sx, q10_sy, q10_sz, q10_angle, q10_tx, q10_ty, q10_tz
-
-    pygame.init()
-    display = (1200, 800)
-    pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+# --------- GL setup and per-frame drawing ---------
+def init_gl(display):
     glEnable(GL_DEPTH_TEST)
     glClearColor(0.1, 0.1, 0.1, 1.0)
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
-    gluPerspective(45, (display[0] / display[1]), 0.1, 50.0)
+    global aspect_ratio
+    aspect_ratio = display[0] / display[1]
+    fovy, near, far = PERSPECTIVE
+    glLoadMatrixf(column_major(perspective_matrix(fovy, aspect_ratio, near, far)))
     glMatrixMode(GL_MODELVIEW)
     glLoadIdentity()
     glTranslatef(0.0, 0.0, -10)
 
-    current_question = 1
+def draw_frame(state=None):
+    state = state or scene
+    utils.begin_lod_frame()     # Spheres and cylinders share one vertex budget per frame
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    # For Q2, use custom camera, otherwise use default
+    glLoadMatrixf(view_matrix(*camera(state.current_question, state)))
+    draw_question(state.current_question, state)
+
+def prepare_frame(state=None):
+    """Build the cached matrices and geometry draw_frame will use.
+
+    draw_frame builds them itself when needed; calling this first lets the
+    frame timer tell matrix building apart from GL submission.
+    """
+    state = state or scene
+    q = state.current_question
+    p = state.question(q)
+    view_matrix(*camera(q, state))
+    if q in (5, 6, 8, 9, 10):
+        question_matrix(q, p.values())
+    elif q == 3:
+        stretched_clock(p.stretch)
+
+# --------- Frame timing overlay ---------
+FRAME_PHASES = ('events', 'input', 'matrices', 'draw', 'overlay', 'caption', 'flip')
+OVERLAY_REFRESH_MS = 500
+_overlay_font = None
+
+def render_overlay(lines):
+    """Text lines as bottom-up RGBA bytes for glDrawPixels, plus their size"""
+    global _overlay_font
+    if _overlay_font is None:
+        _overlay_font = pygame.font.Font(None, 22)
+    rendered = [_overlay_font.render(line, True, (255, 255, 0)) for line in lines]
+    width = max(r.get_width() for r in rendered) + 8
+    height = sum(r.get_height() for r in rendered) + 8
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 160))
+    y = 4
+    for r in rendered:
+        surface.blit(r, (4, y))
+        y += r.get_height()
+    return pygame.image.tobytes(surface, 'RGBA', True), (width, height)
+
+def draw_overlay(image, size, display):
+    """Blend an RGBA image into the top-left corner of the window"""
+    glDisable(GL_DEPTH_TEST)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glWindowPos2i(10, display[1] - size[1] - 10)
+    glDrawPixels(size[0], size[1], GL_RGBA, GL_UNSIGNED_BYTE, image)
+    glDisable(GL_BLEND)
+    glEnable(GL_DEPTH_TEST)
+
+# --------- Startup ---------
+# Budgets in ms from the top of main.py, checked by --startup-profile
+STARTUP_BUDGET_MS = {'window': 600, 'first frame': 900}
+
+def main(redraw_on_demand=False, timing_out=None, trace_gl=None, startup_profile=False):
+    # With redraw_on_demand the loop sleeps in pygame.event.wait while idle and
+    # only redraws when the question or its parameters change; the last
+    # flipped frame stays on screen in between.
+    # Every drawn frame is timed per phase; F3 toggles the percentile overlay
+    # and timing_out (.csv or .json) receives the summary on exit.
+    # With trace_gl, every GL call is counted and timed per frame and question
+    # and the per-frame averages are written to that JSON path on exit.
+    # With startup_profile, the time to each startup milestone is printed
+    # once the first frame is on screen.
+    profile = StartupProfile(_start_ns, STARTUP_BUDGET_MS)
+    profile.mark('imports')
+    pygame.init()
+    display = (1200, 800)
+    pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+    pygame.display.set_caption(f"Computer Graphics Project - Question {scene.current_question}")
+    pygame.event.pump()
+    profile.mark('window')
+    load_gl()
+    profile.mark('opengl')
+    init_gl(display)
+    profile.mark('gl setup')
+
+    drawn_state = None
+    timer = FrameTimer(FRAME_PHASES)
+    show_timing = False
+    overlay = None
+    overlay_time = None
+    key_down_at = {}    # held control key -> time it went down, in seconds
+    last_input = 0.0
+    clock = pygame.time.Clock()
+
+    tracer = None
+    if trace_gl:
+        from gl_record import GLTracer, save_results
+        # utils draws the vertex-array geometry, so trace its GL calls too
+        tracer = GLTracer().install(sys.modules[__name__], utils)
+
+    def shutdown():
+        pygame.quit()
+        if timing_out:
+            timer.export(timing_out)
+        if tracer:
+            tracer.uninstall()
+            save_results(tracer.summary(), trace_gl)
 
     while True:
-        for event in pygame.event.get():
+        if (redraw_on_demand and not key_down_at
+                and drawn_state == (scene.current_question, question_state(scene.current_question))):
+            # Nothing changed since the last flip and no key is held: block until something happens
+            events = [pygame.event.wait()]
+        else:
+            if redraw_on_demand:
+                # A held key or a pending redraw: don't spin faster than HELD_KEY_FPS
+                clock.tick(HELD_KEY_FPS)
+            events = []
+        timer.begin_frame()
+        events += pygame.event.get()
+        now = pygame.time.get_ticks() / 1000.0
+        timer.mark('events')
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
+                shutdown()
                 return
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                drawn_state = None  # Window contents were lost, draw again
             if event.type == pygame.KEYDOWN:
                 # Switch between questions
                 if pygame.K_1 <= event.key <= pygame.K_9:
-                    current_question = event.key - pygame.K_0
+                    scene.current_question = event.key - pygame.K_0
+                    key_down_at.clear()
                 elif event.key == pygame.K_0:
-                    current_question = 10
+                    scene.current_question = 10
+                    key_down_at.clear()
                 elif event.key == pygame.K_ESCAPE:
-                    pygame.quit()
+                    shutdown()
                     return
+                elif event.key == pygame.K_F3:
+                    show_timing = not show_timing
+                    drawn_state = None
                 # Controls for each question
-                if current_question == 1:
-                    # Q1: Move, scale, rotate
-                    if event.key == pygame.K_LEFT: q1_translation[0] -= 0.2
-                    if event.key == pygame.K_RIGHT: q1_translation[0] += 0.2
-                    if event.key == pygame.K_UP: q1_translation[1] += 0.2
-                    if event.key == pygame.K_DOWN: q1_translation[1] -= 0.2
-                    if event.key == pygame.K_w: q1_scale = [x+0.1 for x in q1_scale]
-                    if event.key == pygame.K_s: q1_scale = [max(0.1,x-0.1) for x in q1_scale]
-                    if event.key == pygame.K_a: q1_angle += 5
-                    if event.key == pygame.K_d: q1_angle -= 5
-                elif current_question == 2:
-                    # Q2: Move camera
-                    if event.key == pygame.K_LEFT: q2_camera[0] -= 0.5
-                    if event.key == pygame.K_RIGHT: q2_camera[0] += 0.5
-                    if event.key == pygame.K_UP: q2_camera[1] += 0.5
-                    if event.key == pygame.K_DOWN: q2_camera[1] -= 0.5
-                    if event.key == pygame.K_w: q2_camera[2] -= 0.5
-                    if event.key == pygame.K_s: q2_camera[2] += 0.5
-                elif current_question == 3:
-                    # Q3: Stretch clock
-                    if event.key == pygame.K_w: q3_stretch += 0.1
-                    if event.key == pygame.K_s: q3_stretch = max(0.1, q3_stretch-0.1)
-                elif current_question == 4:
-                    # Q4: Move point, change line
-                    if event.key == pygame.K_LEFT: q4_point[0] -= 0.2
-                    if event.key == pygame.K_RIGHT: q4_point[0] += 0.2
-                    if event.key == pygame.K_UP: q4_point[1] += 0.2
-                    if event.key == pygame.K_DOWN: q4_point[1] -= 0.2
-                    if event.key == pygame.K_w: q4_m += 0.1
-                    if event.key == pygame.K_s: q4_m -= 0.1
-                    if event.key == pygame.K_a: q4_b += 0.1
-                    if event.key == pygame.K_d: q4_b -= 0.1
-                elif current_question == 5:
-                    # Q5: Change parameter a
-                    if event.key == pygame.K_w: q5_a += 0.2
-                    if event.key == pygame.K_s: q5_a = max(0.1, q5_a-0.2)
-                elif current_question == 6:
-                    # Q6: Shear and rotate
-                    if event.key == pygame.K_w: q6_shear += 0.1
-                    if event.key == pygame.K_s: q6_shear -= 0.1
-                    if event.key == pygame.K_a: q6_angle += 5
-                    if event.key == pygame.K_d: q6_angle -= 5
-                elif current_question == 7:
-                    # Q7: Rotate and move square
-                    if event.key == pygame.K_a: q7_angle += 5
-                    if event.key == pygame.K_d: q7_angle -= 5
-                    if event.key == pygame.K_LEFT: q7_tx -= 0.2
-                    if event.key == pygame.K_RIGHT: q7_tx += 0.2
-                    if event.key == pygame.K_UP: q7_ty += 0.2
-                    if event.key == pygame.K_DOWN: q7_ty -= 0.2
-                elif current_question == 8:
-                    # Q8: Scale cube
-                    if event.key == pygame.K_w: q8_sx += 0.1
-                    if event.key == pygame.K_s: q8_sx = max(0.1, q8_sx-0.1)
-                    if event.key == pygame.K_a: q8_sy += 0.1
-                    if event.key == pygame.K_d: q8_sy = max(0.1, q8_sy-0.1)
-                    if event.key == pygame.K_q: q8_sz += 0.1
-                    if event.key == pygame.K_e: q8_sz = max(0.1, q8_sz-0.1)
-                elif current_question == 9:
-                    # Q9: Rotate cube
-                    if event.key == pygame.K_a: q9_angle += 5
-                    if event.key == pygame.K_d: q9_angle -= 5
-                elif current_question == 10:
-                    # Q10: Scale, rotate, translate cube
-                    if event.key == pygame.K_w: q10_sx += 0.1
-                    if event.key == pygame.K_s: q10_sx = max(0.1, q10_sx-0.1)
-                    if event.key == pygame.K_a: q10_sy += 0.1
-                    if event.key == pygame.K_d: q10_sy = max(0.1, q10_sy-0.1)
-                    if event.key == pygame.K_q: q10_sz += 0.1
-                    if event.key == pygame.K_e: q10_sz = max(0.1, q10_sz-0.1)
-                    if event.key == pygame.K_LEFT: q10_tx -= 0.2
-                    if event.key == pygame.K_RIGHT: q10_tx += 0.2
-                    if event.key == pygame.K_UP: q10_ty += 0.2
-                    if event.key == pygame.K_DOWN: q10_ty -= 0.2
-                    if event.key == pygame.K_z: q10_angle += 5
-                    if event.key == pygame.K_x: q10_angle -= 5
-
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glLoadIdentity()
-        # For Q2, use custom camera, otherwise use default
-        if current_question == 2:
-            gluLookAt(*q2_camera, *q2_look, *q2_up)
-        else:
-            gluLookAt(0, 2, 10, 0, 0, 0, 0, 1, 0)
+                action = KEY_ACTIONS.get((scene.current_question, event.key))
+                if action:
+                    apply_action(scene.question(scene.current_question), action)
+                    key_down_at[event.key] = now
+            elif event.type == pygame.KEYUP:
+                key_down_at.pop(event.key, None)
+        if key_down_at:
+            apply_held_keys(scene, pygame.key.get_pressed(), key_down_at, last_input, now)
+        last_input = now
+        timer.mark('input')
+
+        state = (scene.current_question, question_state(scene.current_question))
+        if redraw_on_demand and state == drawn_state:
+            timer.cancel_frame()
+            continue
+        drawn_state = state
 
-        draw_question(current_question)
+        prepare_frame()
+        timer.mark('matrices')
+        if tracer:
+            tracer.begin_frame()
+        draw_frame()
+        timer.mark('draw')
+        if show_timing:
+            now = pygame.time.get_ticks()
+            if overlay is None or now - overlay_time >= OVERLAY_REFRESH_MS:
+                overlay = render_overlay(timer.report_lines(scene.current_question))
+                overlay_time = now
+            draw_overlay(*overlay, display)
+        if tracer:
+            tracer.end_frame(scene.current_question)
+        timer.mark('overlay')
 
-        pygame.display.set_caption(f"Computer Graphics Project - Question {current_question}")
+        pygame.display.set_caption(f"Computer Graphics Project - Question {scene.current_question}")
+        timer.mark('caption')
         pygame.display.flip()
-        pygame.time.wait(10)
+        timer.mark('flip')
+        timer.end_frame(scene.current_question)
+        if profile:
+            profile.mark('first frame')
+            if startup_profile:
+                print("\n".join(profile.report_lines()), file=sys.stderr)
+            profile = None
+        if not redraw_on_demand:
+            pygame.time.wait(10)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Computer Graphics Project")
+    parser.add_argument('--on-demand', action='store_true',
+                        help="only redraw when the question or its parameters change")
+    parser.add_argument('--timing-out', metavar='PATH',
+                        help="write per-question frame phase percentiles to PATH (.csv or .json) on exit")
+    parser.add_argument('--trace-gl', metavar='PATH',
+                        help="count and time every GL call, writing per-question averages to PATH on exit")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print the time taken to reach each startup milestone once the first frame is shown")
+    args = parser.parse_args()
+    main(redraw_on_demand=args.on_demand, timing_out=args.timing_out, trace_gl=args.trace_gl,
+         startup_profile=args.startup_profile)
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Content-addressed on-disk cache of generated meshes.
+
+Each mesh is stored as float32 vertices.npy (plus uint32 indices.npy when
+it is indexed) in a directory named after a hash of the generator name,
+its parameters and a version. A manifest.json written with them records
+which arrays the mesh has and their shapes; an entry whose files do not
+match it is a miss and gets rebuilt. Later runs open the files with
+mmap_mode='r', so a large tessellation costs a file open instead of a
+rebuild, and GL reads the vertex data straight from the mapped pages:
+
+    cache = MeshCache('~/.cache/cg_project/meshes')
+    vertices, indices = cache.get('sphere', (1.0, 512, 512), build, version=1)
+
+Bump the version whenever a generator's output changes; old entries are
+never looked up again and age out. The cache is opt-in: utils only uses
+one when MESH_CACHE_DIR is set. Meshes below `min_bytes` are cheaper to
+rebuild than to open and are not stored, and once the entries exceed
+`max_bytes` the least recently used ones are deleted.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+_ARRAYS = {'vertices': np.float32, 'indices': np.uint32}   # File stem -> dtype
+_MANIFEST = 'manifest.json'
+
+def default_cache_dir():
+    """$MESH_CACHE_DIR, or None when it is unset or empty (no disk cache)"""
+    root = os.environ.get('MESH_CACHE_DIR')
+    return os.path.expanduser(root) if root else None
+
+class MeshCache:
+    def __init__(self, root, max_bytes=256 << 20, min_bytes=64 << 10):
+        self.root = os.path.expanduser(root)
+        self.max_bytes = max_bytes
+        self.min_bytes = min_bytes
+
+    def key(self, name, params, version=0):
+        """Directory name of a mesh: the generator name and a digest of everything it depends on"""
+        blob = json.dumps([name, params, version], sort_keys=True, separators=(',', ':'))
+        return f"{name}-{hashlib.sha256(blob.encode()).hexdigest()[:24]}"
+
+    def path(self, name, params, version=0):
+        return os.path.join(self.root, self.key(name, params, version))
+
+    def load(self, name, params, version=0):
+        """Memory-mapped (vertices, indices or None), or None when not cached"""
+        entry = self.path(name, params, version)
+        arrays = {}
+        try:
+            with open(os.path.join(entry, _MANIFEST)) as f:
+                manifest = json.load(f)
+            for stem, dtype in _ARRAYS.items():
+                shape = manifest[stem]
+                if shape is None:
+                    arrays[stem] = None
+                    continue
+                array = np.load(os.path.join(entry, stem + '.npy'), mmap_mode='r')
+                if array.dtype != dtype or list(array.shape) != shape:
+                    return None
+                arrays[stem] = array
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, truncated or unreadable: treat as a miss and rebuild
+            return None
+        try:
+            os.utime(entry)     # Recently used entries are evicted last
+        except OSError:
+            pass
+        return arrays['vertices'], arrays['indices']
+
+    def store(self, name, params, vertices, indices=None, version=0):
+        """Write a mesh and return it memory-mapped from disk.
+
+        The entry is written to a temporary directory and renamed into
+        place, so concurrent runs never see a half-written mesh.
+        """
+        entry = self.path(name, params, version)
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self.root)
+        try:
+            manifest = {}
+            for stem, array in (('vertices', vertices), ('indices', indices)):
+                manifest[stem] = None if array is None else list(np.shape(array))
+                if array is not None:
+                    np.save(os.path.join(tmp, stem + '.npy'), np.ascontiguousarray(array, dtype=_ARRAYS[stem]))
+            with open(os.path.join(tmp, _MANIFEST), 'w') as f:
+                json.dump(manifest, f)
+            try:
+                os.rename(tmp, entry)
+            except OSError:
+                # Either another run stored the same mesh first (keep its
+                # identical copy) or a damaged entry is in the way
+                if self.load(name, params, version) is None:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    os.rename(tmp, entry)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=os.path.basename(entry))
+        return self.load(name, params, version)
+
+    def get(self, name, params, build, version=0):
+        """Cached mesh, or build() -> (vertices, indices) stored and then mapped.
+
+        Meshes under min_bytes, and any mesh when the cache directory cannot
+        be written, are returned as built.
+        """
+        cached = self.load(name, params, version)
+        if cached is not None:
+            return cached
+        vertices, indices = build()
+        size = vertices.nbytes + (0 if indices is None else indices.nbytes)
+        if size < self.min_bytes:
+            return vertices, indices
+        try:
+            return self.store(name, params, vertices, indices, version) or (vertices, indices)
+        except OSError:
+            return vertices, indices
+
+    def entries(self):
+        """(last used time, bytes, directory name) of every stored mesh"""
+        found = []
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return found
+        for name in names:
+            if name.startswith('.tmp-'):
+                continue
+            entry = os.path.join(self.root, name)
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+                found.append((os.path.getmtime(entry), size, name))
+            except OSError:
+                continue
+        return found
+
+    def evict(self, keep=None):
+        """Delete the least recently used entries until they fit in max_bytes.
+
+        Meshes already mapped stay readable until they are unmapped.
+        """
+        if self.max_bytes is None:
+            return
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            if name != keep:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+                total -= size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,69 @@
+"""Stream huge point clouds stored as .npy files through an affine transform.
+
+The input is opened with mmap_mode='r' and processed in fixed-size chunks
+that are written straight into a memory-mapped .npy output, so memory use
+is bounded by the chunk size whatever the input size:
+
+    python pointcloud.py scan.npy scan_q6.npy --question 6
+    python pointcloud.py scan.npy moved.npy --matrix M.npy --chunk-rows 4000000
+
+Points are the rows of an (N, C) array with C >= 3. The first three
+columns (x, y, z) are transformed and any extra columns are copied as is.
+"""
+import argparse
+
+import numpy as np
+
+from transforms import Affine, TransformChain
+
+def as_affine(transform):
+    """Accept an Affine, a TransformChain or a (3,4)/(4,4) matrix"""
+    if isinstance(transform, Affine):
+        return transform
+    if isinstance(transform, TransformChain):
+        return transform.affine()
+    return Affine(transform)
+
+def transform_npy(src, dst, transform, chunk_rows=1 << 20, dtype=np.float32):
+    """Transform the points of src.npy into a new dst.npy of the given dtype"""
+    points = np.load(src, mmap_mode='r')
+    if points.ndim != 2 or points.shape[1] < 3:
+        raise ValueError(f"expected an (N, C>=3) array of points, got shape {points.shape}")
+    affine = as_affine(transform).astype(dtype)
+    linear_t = np.ascontiguousarray(affine.linear.T)
+    translation = affine.translation
+    out = np.lib.format.open_memmap(dst, mode='w+', dtype=dtype, shape=points.shape)
+    # Two reusable chunk buffers: input converted to dtype, and the result
+    chunk_in = np.empty((min(chunk_rows, len(points)), 3), dtype=dtype)
+    chunk_out = np.empty_like(chunk_in)
+    for start in range(0, len(points), chunk_rows):
+        stop = min(start + chunk_rows, len(points))
+        src_xyz, dst_xyz = chunk_in[:stop - start], chunk_out[:stop - start]
+        src_xyz[...] = points[start:stop, :3]
+        np.matmul(src_xyz, linear_t, out=dst_xyz)
+        dst_xyz += translation
+        out[start:stop, :3] = dst_xyz
+        if points.shape[1] > 3:
+            out[start:stop, 3:] = points[start:stop, 3:]
+    out.flush()
+    return out
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transform a .npy point cloud in bounded memory")
+    parser.add_argument('src')
+    parser.add_argument('dst')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--question', type=int, choices=(1, 5, 6, 8, 9, 10),
+                        help="use this question's composite matrix (default parameters)")
+    source.add_argument('--matrix', help=".npy file holding a 4x4 or 3x4 matrix")
+    parser.add_argument('--chunk-rows', type=int, default=1 << 20)
+    parser.add_argument('--float64', action='store_true', help="write float64 instead of float32")
+    args = parser.parse_args()
+    if args.question is not None:
+        from scene_state import SceneState
+        from transforms import question_chain
+        transform = question_chain(args.question, SceneState().question(args.question).values())
+    else:
+        transform = np.load(args.matrix)
+    transform_npy(args.src, args.dst, transform, args.chunk_rows,
+                  np.float64 if args.float64 else np.float32)
@@ -0,0 +1,51 @@
+"""Importable API for the Question1-Question10 assignment scripts.
+
+Importing this module (or any QuestionN) only loads numpy: every question
+exposes its computation as solve(**params), returning a dict of arrays,
+and plot(result=None), which imports matplotlib on first use and returns
+the figure without showing it. Running a QuestionN script directly still
+shows the plot and prints its results.
+
+    from questions import reflect_over_line, solve, plot
+    reflect_over_line(6, 0)                  # (-3.0, 9.0)
+    solve(5, a=3)['transformed_point']
+    plot(8).savefig('question8.png')
+"""
+import Question1
+import Question2
+import Question3
+import Question4
+import Question5
+import Question6
+import Question7
+import Question8
+import Question9
+import Question10
+
+from Question1 import get_translation_matrix, get_z_rotation_matrix, get_scaling_matrix
+from Question2 import calculate_view_matrix
+from Question3 import create_clock_points, create_stretch_matrix
+from Question4 import reflect_over_line
+from Question5 import composite_transformation
+from Question6 import composite_transform
+from Question7 import square_transform_matrix
+
+QUESTION_MODULES = {
+    1: Question1, 2: Question2, 3: Question3, 4: Question4, 5: Question5,
+    6: Question6, 7: Question7, 8: Question8, 9: Question9, 10: Question10,
+}
+
+def _module(q):
+    try:
+        return QUESTION_MODULES[q]
+    except KeyError:
+        raise ValueError(f"no question {q!r}; expected 1-{len(QUESTION_MODULES)}") from None
+
+def solve(q, **params):
+    """Results of question q as a dict (see QuestionN.solve for params)"""
+    return _module(q).solve(**params)
+
+def plot(q, result=None, **params):
+    """matplotlib figure for question q; solves with params if no result is given"""
+    module = _module(q)
+    return module.plot(result if result is not None else module.solve(**params))
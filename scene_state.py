@@ -0,0 +1,140 @@
+"""Interactive parameters of every question as compact slot dataclasses.
+
+Vector parameters are stored as tuples, so a state can be copied by
+rebuilding it from its field values and compared or used as a cache key
+without walking nested lists.
+"""
+import json
+from dataclasses import dataclass, field
+
+class QuestionState:
+    """Base for the per-question parameter records"""
+    __slots__ = ()
+
+    def values(self):
+        """Field values as a hashable tuple, in declaration order"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def copy(self):
+        return type(self)(*self.values())
+
+    def to_dict(self):
+        return {name: list(v) if isinstance(v, tuple) else v
+                for name, v in zip(self.__slots__, self.values())}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: tuple(v) if isinstance(v, list) else v
+                      for name, v in data.items()})
+
+# Q1: Translation, Rotation, Scaling
+@dataclass(slots=True)
+class Q1State(QuestionState):
+    translation: tuple = (0.0, 0.0, 0.0)
+    angle: float = 0.0
+    scale: tuple = (1.0, 1.0, 1.0)
+
+# Q2: Camera parameters
+@dataclass(slots=True)
+class Q2State(QuestionState):
+    camera: tuple = (0.0, 1.0, 8.0)
+    look: tuple = (0.0, 0.0, 0.0)
+    up: tuple = (0.0, 1.0, 0.0)
+
+# Q3: Clock stretching
+@dataclass(slots=True)
+class Q3State(QuestionState):
+    stretch: float = 1.0
+
+# Q4: Reflection
+@dataclass(slots=True)
+class Q4State(QuestionState):
+    point: tuple = (3.0, 0.0)
+    m: float = 1.0
+    b: float = 3.0
+
+# Q5: Composite transform
+@dataclass(slots=True)
+class Q5State(QuestionState):
+    a: float = 2.0
+
+# Q6: Shear, Taper, Scale, Rotate, Translate
+@dataclass(slots=True)
+class Q6State(QuestionState):
+    shear: float = 0.5
+    taper: float = 0.2
+    scale: float = 3.0
+    angle: float = 45.0
+    trans: tuple = (-2, 3, 1)
+
+# Q7: Square rotate/translate
+@dataclass(slots=True)
+class Q7State(QuestionState):
+    angle: float = 45.0
+    tx: float = 3.0
+    ty: float = 2.0
+
+# Q8: Cube scaling
+@dataclass(slots=True)
+class Q8State(QuestionState):
+    sx: float = 2.0
+    sy: float = 1.0
+    sz: float = 0.5
+
+# Q9: Cube rotation
+@dataclass(slots=True)
+class Q9State(QuestionState):
+    angle: float = 45.0
+
+# Q10: Scale, rotate, translate
+@dataclass(slots=True)
+class Q10State(QuestionState):
+    sx: float = 2.0
+    sy: float = 1.5
+    sz: float = 1.0
+    angle: float = 30.0
+    tx: float = 3.0
+    ty: float = 2.0
+    tz: float = 1.0
+
+QUESTION_STATE_TYPES = (
+    Q1State, Q2State, Q3State, Q4State, Q5State,
+    Q6State, Q7State, Q8State, Q9State, Q10State,
+)
+
+@dataclass(slots=True)
+class SceneState:
+    """Current question plus the parameters of all ten questions"""
+    current_question: int = 1
+    questions: tuple = field(default_factory=lambda: tuple(cls() for cls in QUESTION_STATE_TYPES))
+
+    def question(self, q):
+        return self.questions[q - 1]
+
+    def key(self):
+        """Hashable snapshot of the whole scene"""
+        return (self.current_question,) + tuple(s.values() for s in self.questions)
+
+    def copy(self):
+        return SceneState(self.current_question, tuple(s.copy() for s in self.questions))
+
+    def to_dict(self):
+        return {
+            'current_question': self.current_question,
+            'questions': [s.to_dict() for s in self.questions],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        questions = tuple(state_type.from_dict(d)
+                          for state_type, d in zip(QUESTION_STATE_TYPES, data['questions']))
+        return cls(data['current_question'], questions)
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
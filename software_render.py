@@ -0,0 +1,626 @@
+"""Pure-NumPy software rendering of the questions drawn by main.py.
+
+SoftwareRenderer stands in for the fixed-function OpenGL calls used by
+main.py (matrix stacks including glLoadMatrixf, glBegin/glEnd immediate
+mode, glDrawArrays on numpy client arrays, gluLookAt and gluPerspective).
+Primitives are collected during the frame and rasterized in one
+vectorized pass into an RGB + depth framebuffer, so the scenes can be
+rendered on machines without a display or GPU:
+
+    rgb, depth = render_question(6)
+    write_png('q6.png', rgb)
+
+GL calls it does not implement (normals and lighting among them) are
+ignored.
+"""
+import ctypes
+import struct
+import zlib
+
+import numpy as np
+from OpenGL.GL import (
+    GL_COLOR_ARRAY, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT, GL_DEPTH_TEST, GL_DOUBLE,
+    GL_FLOAT, GL_LINE_LOOP, GL_LINE_STRIP, GL_LINES, GL_MODELVIEW, GL_POINTS, GL_PROJECTION,
+    GL_QUAD_STRIP, GL_QUADS, GL_TRIANGLE_STRIP, GL_TRIANGLES, GL_VERTEX_ARRAY,
+)
+
+from gl_record import GLBackend
+from transforms import look_at_matrices, perspective_matrix
+import utils
+from utils import rotation_matrices
+
+def look_at_matrix(eye, center, up):
+    """The matrix gluLookAt multiplies onto the current matrix"""
+    return look_at_matrices(eye, center, up)
+
+# Vertex index patterns turning each glBegin mode into points, lines or triangles
+def _pairs(n, loop):
+    i = np.arange(n - 1 if n > 1 else 0)
+    pairs = np.stack([i, i + 1], axis=-1)
+    if loop and n > 2:
+        pairs = np.vstack([pairs, [[n - 1, 0]]])
+    return pairs
+
+def _fan(n):
+    i = np.arange(1, n - 1)
+    return np.stack([np.zeros_like(i), i, i + 1], axis=-1)
+
+def _strip(n):
+    i = np.arange(n - 2)
+    return np.stack([i, i + 1, i + 2], axis=-1)
+
+def _quads(n):
+    base = np.arange(0, n - 3, 4)[:, None]
+    return np.vstack([base + [0, 1, 2], base + [0, 2, 3]])
+
+# In-place versions of np.repeat(np.arange(len(counts)), counts) and of the
+# position within each repeat, written into out (len(out) == counts.sum())
+def _repeat_index(counts, out):
+    nonzero = np.flatnonzero(counts)
+    out[:] = 0
+    if len(nonzero):
+        starts = np.cumsum(counts[nonzero]) - counts[nonzero]
+        out[0] = nonzero[0]
+        out[starts[1:]] = np.diff(nonzero)
+        np.cumsum(out, out=out, dtype=out.dtype)
+    return out
+
+def _ramps(counts, out):
+    counts = counts[counts > 0]
+    out[:] = 1
+    if len(out):
+        out[0] = 0
+        out[np.cumsum(counts[:-1])] = 1 - counts[:-1]
+        np.cumsum(out, out=out, dtype=out.dtype)
+    return out
+
+# numpy dtypes of the GL types accepted for client arrays given as addresses
+_ARRAY_TYPES = {GL_FLOAT: np.dtype(np.float32), GL_DOUBLE: np.dtype(np.float64)}
+
+class SoftwareRenderer(GLBackend):
+    """Fixed-function GL subset rasterized with NumPy into an RGB + depth buffer"""
+
+    def __init__(self, width=1200, height=800):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.rgb = np.zeros((height, width, 3), dtype=np.uint8)
+        self.depth = np.ones((height, width), dtype=np.float32)
+        self._clear_color = np.zeros(3)
+        self._clear_rgb = None      # A full cleared frame, rows are copied from it
+        # Rows [start, stop) drawn to since the last clear, per buffer
+        self._dirty = {GL_COLOR_BUFFER_BIT: (0, height), GL_DEPTH_BUFFER_BIT: (0, height)}
+        self.initialized = False    # Set once main.init_gl has run on this renderer
+        self._depth_test = False
+        self._point_size = 1.0
+        self._color = np.ones(3)
+        self._stacks = {}
+        self._matrix_mode = None
+        self._begin_mode = None
+        self._vertices = []
+        self._colors = []
+        self._arrays = {}
+        self._enabled_arrays = set()
+        self._buffers = {}          # Scratch arrays kept between frames, see _scratch
+        self._reset_frame()
+
+    def _stub(self, name, original):
+        method = getattr(self, name, None)
+        if method is None:
+            def method(*args):
+                pass
+        return method
+
+    def _scratch(self, name, n, dtype):
+        """First n items of the scratch array `name`, grown as needed.
+
+        Per-fragment arrays are built in these rather than allocated each
+        frame: faulting in fresh pages for a large frame's temporaries costs
+        more than the arithmetic done on them. Contents last until the next
+        request for the same name.
+        """
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) < n:
+            buffer = self._buffers[name] = np.empty(n + n // 4, dtype=dtype)
+        return buffer[:n]
+
+    def _take(self, name, array, index):
+        """array[index] (along the first axis) in the scratch array `name`"""
+        shape = (len(index),) + array.shape[1:]
+        out = self._scratch(name, int(np.prod(shape)), array.dtype).reshape(shape)
+        # The indices are always valid; mode='clip' stops np.take buffering out
+        return np.take(array, index, axis=0, out=out, mode='clip')
+
+    def _reset_frame(self):
+        # Per-frame primitive batches: (clip coords, colors, index array, sequence)
+        self._points = []
+        self._lines = []
+        self._triangles = []
+        self._sequence = 0
+
+    # --------- State ---------
+    def glEnable(self, cap):
+        if cap == GL_DEPTH_TEST:
+            self._depth_test = True
+
+    def glDisable(self, cap):
+        if cap == GL_DEPTH_TEST:
+            self._depth_test = False
+
+    def glClearColor(self, r, g, b, a=1.0):
+        color = np.array([r, g, b])
+        if not np.array_equal(color, self._clear_color):
+            self._dirty[GL_COLOR_BUFFER_BIT] = (0, self.height)
+            self._clear_rgb = None
+        self._clear_color = color
+
+    def glClear(self, mask):
+        # Only the rows drawn to since the previous clear need resetting
+        if mask & GL_COLOR_BUFFER_BIT:
+            if self._clear_rgb is None:
+                self._clear_rgb = np.empty_like(self.rgb)
+                self._clear_rgb[...] = np.clip(self._clear_color * 255 + 0.5, 0, 255).astype(np.uint8)
+            start, stop = self._dirty[GL_COLOR_BUFFER_BIT]
+            self.rgb[start:stop] = self._clear_rgb[start:stop]
+            self._dirty[GL_COLOR_BUFFER_BIT] = (self.height, 0)
+        if mask & GL_DEPTH_BUFFER_BIT:
+            start, stop = self._dirty[GL_DEPTH_BUFFER_BIT]
+            self.depth[start:stop] = 1.0
+            self._dirty[GL_DEPTH_BUFFER_BIT] = (self.height, 0)
+        self._reset_frame()
+
+    def _touch(self, buffer, pixel):
+        """Widen the dirty rows of buffer to cover the flat pixel indices"""
+        if len(pixel):
+            start, stop = self._dirty[buffer]
+            self._dirty[buffer] = (min(start, int(pixel.min()) // self.width),
+                                   max(stop, int(pixel.max()) // self.width + 1))
+
+    def glColor3f(self, r, g, b):
+        self._color = np.array([r, g, b], dtype=float)
+
+    def glColor3fv(self, v):
+        self.glColor3f(*v)
+
+    def glPointSize(self, size):
+        self._point_size = float(size)
+
+    # --------- Matrix stacks ---------
+    def glMatrixMode(self, mode):
+        self._matrix_mode = mode
+        self._stacks.setdefault(mode, [np.eye(4)])
+
+    def _current(self):
+        if self._matrix_mode is None:
+            self.glMatrixMode(GL_MODELVIEW)
+        return self._stacks[self._matrix_mode]
+
+    def _multiply(self, matrix):
+        stack = self._current()
+        stack[-1] = stack[-1] @ matrix
+
+    def glLoadIdentity(self):
+        self._current()[-1] = np.eye(4)
+
+    def glLoadMatrixf(self, m):
+        # GL matrices are column-major
+        self._current()[-1] = np.array(m, dtype=float).reshape(4, 4).T
+
+    def glMultMatrixf(self, m):
+        self._multiply(np.array(m, dtype=float).reshape(4, 4).T)
+
+    def glPushMatrix(self):
+        stack = self._current()
+        stack.append(stack[-1].copy())
+
+    def glPopMatrix(self):
+        self._current().pop()
+
+    def glTranslatef(self, x, y, z):
+        m = np.eye(4)
+        m[:3, 3] = (x, y, z)
+        self._multiply(m)
+
+    def glRotatef(self, angle, x, y, z):
+        self._multiply(rotation_matrices(angle, (x, y, z))[0])
+
+    def glScalef(self, x, y, z):
+        self._multiply(np.diag([x, y, z, 1.0]))
+
+    def gluLookAt(self, ex, ey, ez, cx, cy, cz, ux, uy, uz):
+        self._multiply(look_at_matrix((ex, ey, ez), (cx, cy, cz), (ux, uy, uz)))
+
+    def gluPerspective(self, fovy, aspect, near, far):
+        self._multiply(perspective_matrix(fovy, aspect, near, far))
+
+    # --------- Immediate mode ---------
+    def glBegin(self, mode):
+        self._begin_mode = mode
+        self._vertices = []
+        self._colors = []
+
+    def glVertex3f(self, x, y, z):
+        self._vertices.append((x, y, z))
+        self._colors.append(self._color)
+
+    def glVertex3fv(self, v):
+        self.glVertex3f(v[0], v[1], v[2])
+
+    def glVertex2f(self, x, y):
+        self.glVertex3f(x, y, 0.0)
+
+    def glEnd(self):
+        if self._vertices:
+            self._submit(self._begin_mode, np.asarray(self._vertices, dtype=float), np.asarray(self._colors))
+
+    # --------- Client-side vertex arrays ---------
+    # Arrays may be numpy arrays or raw addresses (as passed by
+    # utils.draw_vertex_array for the cached geometry); addresses are read
+    # back through a strided view once the draw call says how many rows
+    # are used.
+    def glEnableClientState(self, array):
+        self._enabled_arrays.add(array)
+
+    def glDisableClientState(self, array):
+        self._enabled_arrays.discard(array)
+
+    def glVertexPointer(self, size, type, stride, pointer):
+        self._arrays[GL_VERTEX_ARRAY] = (size, type, stride, pointer)
+
+    def glColorPointer(self, size, type, stride, pointer):
+        self._arrays[GL_COLOR_ARRAY] = (size, type, stride, pointer)
+
+    def _client_array(self, array, rows):
+        """Enabled client array as (rows, size) values, or None"""
+        size, type, stride, pointer = self._arrays.get(array, (0, None, 0, None))
+        if array not in self._enabled_arrays or pointer is None:
+            return None
+        if isinstance(pointer, np.ndarray):
+            return pointer.reshape(-1, size)
+        dtype = _ARRAY_TYPES.get(type)
+        address = getattr(pointer, 'value', pointer)
+        if dtype is None or not isinstance(address, int) or rows <= 0:
+            return None
+        stride = stride or size * dtype.itemsize
+        nbytes = (rows - 1) * stride + size * dtype.itemsize
+        buffer = (ctypes.c_char * nbytes).from_address(address)
+        return np.ndarray((rows, size), dtype, buffer, strides=(stride, dtype.itemsize))
+
+    def _draw_client_arrays(self, mode, index, rows):
+        vertices = self._client_array(GL_VERTEX_ARRAY, rows)
+        if vertices is None:
+            return
+        vertices = vertices[index]
+        if vertices.shape[1] < 3:
+            vertices = np.hstack([vertices, np.zeros((len(vertices), 3 - vertices.shape[1]))])
+        colors = self._client_array(GL_COLOR_ARRAY, rows)
+        if colors is None:
+            colors = np.broadcast_to(self._color, (len(vertices), 3))
+        else:
+            colors = colors[index, :3]
+        self._submit(mode, vertices[:, :3], colors)
+
+    def glDrawArrays(self, mode, first, count):
+        self._draw_client_arrays(mode, slice(first, first + count), first + count)
+
+    def glDrawElements(self, mode, count, type, indices):
+        if isinstance(indices, np.ndarray) and count > 0:
+            indices = indices[:count]
+            self._draw_client_arrays(mode, indices, int(indices.max()) + 1)
+
+    def _submit(self, mode, vertices, colors):
+        """Transform (n, 3) vertices to clip space and queue their primitives"""
+        n = len(vertices)
+        if n == 0:
+            return
+        mvp = self._stacks[GL_PROJECTION][-1] @ self._stacks[GL_MODELVIEW][-1]
+        clip = vertices @ mvp[:, :3].T + mvp[:, 3]
+        if mode == GL_POINTS:
+            batch, index = self._points, np.arange(n)[:, None]
+        elif mode in (GL_LINES, GL_LINE_STRIP, GL_LINE_LOOP):
+            batch = self._lines
+            if mode == GL_LINES:
+                index = np.arange(n - n % 2).reshape(-1, 2)
+            else:
+                index = _pairs(n, loop=mode == GL_LINE_LOOP)
+        else:
+            batch = self._triangles
+            if mode == GL_TRIANGLES:
+                index = np.arange(n - n % 3).reshape(-1, 3)
+            elif mode == GL_QUADS:
+                index = _quads(n)
+            elif mode in (GL_TRIANGLE_STRIP, GL_QUAD_STRIP):
+                index = _strip(n)
+            else:  # GL_TRIANGLE_FAN, GL_POLYGON
+                index = _fan(n)
+        batch.append((clip, colors, index, self._sequence, self._point_size))
+        self._sequence += len(index)
+
+    # --------- Rasterization ---------
+    def _gather(self, batches):
+        """Concatenate batches into per-primitive (P, k, 4) clip coords and colors"""
+        if not batches:
+            return None
+        clip = np.concatenate([c[i] for c, _, i, _, _ in batches])
+        colors = np.concatenate([col[i] for _, col, i, _, _ in batches])
+        sequence = np.concatenate([seq + np.arange(len(i)) for _, _, i, seq, _ in batches])
+        sizes = np.concatenate([np.full(len(i), size) for _, _, i, _, size in batches])
+        return clip, colors, sequence, sizes
+
+    def _to_window(self, clip):
+        ndc = clip[..., :3] / clip[..., 3:4]
+        x = (ndc[..., 0] + 1) * 0.5 * self.width
+        y = (1 - ndc[..., 1]) * 0.5 * self.height  # row 0 is the top of the image
+        z = (ndc[..., 2] + 1) * 0.5
+        return x, y, z
+
+    # Each fragment generator returns parts (pixel, z, sequence, shade): flat
+    # pixel indices inside the viewport, and shade(index, out) writing the
+    # (len(index), 3) colors of the selected fragments into out, so colors are
+    # only computed for depth-test winners.
+    def _clipped(self, px, py, z, color, sequence):
+        """Part of the fragments inside the viewport and depth range"""
+        inside = (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height) & (z >= 0) & (z <= 1)
+        pixel = py[inside].astype(np.int64) * self.width + px[inside].astype(np.int64)
+        color = color[inside].astype(np.float32)
+        return (pixel, z[inside].astype(np.float32), sequence[inside],
+                lambda index, out: np.take(color, index, axis=0, out=out, mode='clip'))
+
+    def _point_fragments(self):
+        gathered = self._gather(self._points)
+        if gathered is None:
+            return None
+        clip, colors, sequence, sizes = gathered
+        clip, colors = clip[:, 0], colors[:, 0]
+        keep = clip[:, 3] > 0
+        x, y, z = self._to_window(clip[keep])
+        colors, sequence, sizes = colors[keep], sequence[keep], sizes[keep]
+        parts = []
+        for size in np.unique(sizes):
+            sel = sizes == size
+            side = max(int(round(size)), 1)
+            offsets = np.arange(side) - (side - 1) / 2.0
+            px = np.floor(x[sel, None, None] + offsets[None, None, :])
+            py = np.floor(y[sel, None, None] + offsets[None, :, None])
+            px, py = np.broadcast_arrays(px, py)
+            count = side * side
+            parts.append(self._clipped(px.reshape(-1), py.reshape(-1),
+                                       np.repeat(z[sel], count), np.repeat(colors[sel], count, axis=0),
+                                       np.repeat(sequence[sel], count)))
+        return parts
+
+    def _line_fragments(self):
+        gathered = self._gather(self._lines)
+        if gathered is None:
+            return None
+        clip, colors, sequence, _ = gathered
+        # Clip against the near plane (z > -w) so segments behind the eye stay finite
+        d = clip[..., 2] + clip[..., 3]
+        keep = (d[:, 0] >= 0) | (d[:, 1] >= 0)
+        clip, colors, sequence, d = clip[keep], colors[keep], sequence[keep], d[keep]
+        t = np.where(np.abs(d[:, 0] - d[:, 1]) > 0, d[:, 0] / (d[:, 0] - d[:, 1] + 1e-300), 0.0)[:, None]
+        crossing = clip[:, 0] + t * (clip[:, 1] - clip[:, 0])
+        crossing_color = colors[:, 0] + t * (colors[:, 1] - colors[:, 0])
+        for end in (0, 1):
+            behind = d[:, end] < 0
+            clip[behind, end] = crossing[behind]
+            colors[behind, end] = crossing_color[behind]
+        x, y, z = self._to_window(clip)
+        # One sample per pixel step along the major axis (DDA)
+        steps = np.ceil(np.maximum(np.abs(x[:, 1] - x[:, 0]), np.abs(y[:, 1] - y[:, 0]))).astype(np.int64)
+        steps = np.minimum(steps, 4 * (self.width + self.height)) + 1
+        owner = np.repeat(np.arange(len(steps)), steps)
+        first = np.repeat(np.cumsum(steps) - steps, steps)
+        u = (np.arange(len(owner)) - first) / np.maximum(steps[owner] - 1, 1)
+        fx = x[owner, 0] + u * (x[owner, 1] - x[owner, 0])
+        fy = y[owner, 0] + u * (y[owner, 1] - y[owner, 0])
+        fz = z[owner, 0] + u * (z[owner, 1] - z[owner, 0])
+        fc = colors[owner, 0] + u[:, None] * (colors[owner, 1] - colors[owner, 0])
+        # Samples on a pixel boundary go to the lower window coordinate, like GL
+        # (window y grows upwards while our rows grow downwards)
+        return [self._clipped(np.ceil(fx) - 1, np.floor(fy), fz, fc, sequence[owner])]
+
+    def _triangle_fragments(self):
+        gathered = self._gather(self._triangles)
+        if gathered is None:
+            return None
+        clip, colors, sequence, _ = gathered
+        # Triangles reaching behind the eye are dropped rather than clipped
+        keep = np.all(clip[..., 3] > 1e-6, axis=1)
+        clip, colors, sequence = clip[keep], colors[keep], sequence[keep]
+        x, y, z = self._to_window(clip)
+        # Depth and color are affine in window space: v = a + b*x + c*y
+        values = np.concatenate([z[..., None], colors], axis=-1).astype(np.float32)
+        d1, d2 = values[:, 1] - values[:, 0], values[:, 2] - values[:, 0]
+        ex1, ey1 = (x[:, 1] - x[:, 0])[:, None], (y[:, 1] - y[:, 0])[:, None]
+        ex2, ey2 = (x[:, 2] - x[:, 0])[:, None], (y[:, 2] - y[:, 0])[:, None]
+        area = ex1 * ey2 - ex2 * ey1
+        valid = area[:, 0] != 0
+        area = np.where(area != 0, area, 1.0)
+        grad_x = (d1 * ey2 - d2 * ey1) / area
+        grad_y = (d2 * ex1 - d1 * ex2) / area
+        base = values[:, 0] - grad_x * x[:, :1] - grad_y * y[:, :1]
+        # One span per (triangle, pixel row), bounded by the two edge crossings
+        y0 = np.clip(np.ceil(y.min(axis=1) - 0.5), 0, self.height).astype(np.int64)
+        y1 = np.clip(np.ceil(y.max(axis=1) - 0.5), 0, self.height).astype(np.int64)
+        rows = np.where(valid, np.maximum(y1 - y0, 0), 0)
+        owner = np.repeat(np.arange(len(rows)), rows)
+        py = y0[owner] + np.arange(len(owner)) - np.repeat(np.cumsum(rows) - rows, rows)
+        sy = (py + 0.5)[:, None]
+        # np.take gathers whole rows much faster than fancy indexing
+        ya, xa = np.take(y, owner, axis=0), np.take(x, owner, axis=0)
+        yb, xb = np.roll(ya, -1, axis=1), np.roll(xa, -1, axis=1)
+        crosses = (ya <= sy) != (yb <= sy)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xc = xa + (sy - ya) * (xb - xa) / (yb - ya)
+        x_left = np.where(crosses, xc, np.inf).min(axis=1)
+        x_right = np.where(crosses, xc, -np.inf).max(axis=1)
+        first = np.clip(np.ceil(x_left - 0.5), 0, self.width).astype(np.int64)
+        last = np.clip(np.ceil(x_right - 0.5), 0, self.width).astype(np.int64)
+        count = np.maximum(last - first, 0)
+        n = int(count.sum())
+        span = _repeat_index(count, self._scratch('span', n, np.int32))
+        step = _ramps(count, self._scratch('step', n, np.int32))
+        # Value at the start of each span, then step by grad_x along the row
+        grad_x = np.take(grad_x, owner, axis=0)
+        start = (np.take(base, owner, axis=0) + grad_x * (first + 0.5)[:, None]
+                 + np.take(grad_y, owner, axis=0) * sy).astype(np.float32)
+        span_grad = grad_x.astype(np.float32)
+        z = self._take('z', span_grad[:, 0], span)
+        z *= step
+        z += self._take('z_start', start[:, 0], span)
+        # Spans are already clamped to the viewport, only depth needs checking
+        pixel = self._take('pixel', py * self.width + first, span)
+        pixel += step
+        sequence = self._take('sequence', sequence[owner], span)
+        inside = np.greater_equal(z, 0, out=self._scratch('inside', n, bool))
+        inside &= np.less_equal(z, 1, out=self._scratch('below_far', n, bool))
+        if not inside.all():
+            span, step = span[inside], step[inside]
+            pixel, z, sequence = pixel[inside], z[inside], sequence[inside]
+
+        span_color_grad = np.ascontiguousarray(span_grad[:, 1:])
+        span_color = np.ascontiguousarray(start[:, 1:])
+
+        def shade(index, out):
+            s = self._take('shade_span', span, index)
+            np.take(span_color_grad, s, axis=0, out=out, mode='clip')
+            out *= self._take('shade_step', step, index)[:, None]
+            out += self._take('shade_start', span_color, s)
+            return out
+        return [(pixel, z, sequence, shade)]
+
+    def finish(self):
+        """Rasterize everything submitted since the last glClear into rgb/depth"""
+        parts = []
+        for fragments in (self._triangle_fragments(), self._line_fragments(), self._point_fragments()):
+            if fragments:
+                parts.extend(fragments)
+        self._reset_frame()
+        if not parts:
+            return self.rgb
+        sizes = [len(part[0]) for part in parts]
+        n = sum(sizes)
+        if len(parts) > 1:
+            pixel, z, sequence = (np.concatenate(arrays, out=self._scratch(name, n, arrays[0].dtype))
+                                  for name, arrays in zip(('all_pixel', 'all_z', 'all_sequence'),
+                                                          list(zip(*parts))[:3]))
+        else:
+            pixel, z, sequence = parts[0][:3]
+        depth = self.depth.reshape(-1)
+        last = int(sequence.max())
+        if self._depth_test:
+            # Nearest fragment per pixel wins, ties go to the first one drawn
+            # (GL_LESS): pack 24-bit depth above the sequence number
+            key_bits = 24 + last.bit_length()
+            key = np.multiply(z, np.float32(0xffffff), out=self._scratch('key', n, np.int64),
+                              casting='unsafe')
+            key <<= last.bit_length()
+            key |= sequence
+        else:
+            key_bits = last.bit_length()
+            key = last - sequence  # last one drawn wins
+        # Sort the fragments by pixel, then key; the first of each pixel wins.
+        # Only touched pixels take part, whatever the framebuffer size. One
+        # packed int64 sorts far faster than lexsort when the bits fit.
+        if (self.width * self.height).bit_length() + key_bits < 63:
+            key |= np.left_shift(pixel, key_bits, out=self._scratch('pixel_key', n, np.int64))
+            order = np.argsort(key, kind='stable')
+        else:
+            order = np.lexsort((key, pixel))
+        pixel = self._take('sorted_pixel', pixel, order)
+        new_pixel = self._scratch('new_pixel', n, bool)
+        new_pixel[0] = True
+        np.not_equal(pixel[1:], pixel[:-1], out=new_pixel[1:])
+        first = np.flatnonzero(new_pixel)
+        m = len(first)
+        pixel = self._take('won_pixel', pixel, first)
+        won = self._take('won', order, first)
+        z = self._take('won_z', z, won)
+        if self._depth_test:
+            passed = np.less(z, self._take('won_depth', depth, pixel),
+                             out=self._scratch('passed', m, bool))
+            if not passed.all():
+                pixel, z, won = pixel[passed], z[passed], won[passed]
+            depth[pixel] = z
+            self._touch(GL_DEPTH_BUFFER_BIT, pixel)
+        # Colors of the winners only, from the part each one came from
+        m = len(won)
+        color = self._scratch('color', 3 * m, np.float32).reshape(m, 3)
+        if len(parts) == 1:
+            parts[0][3](won, color)
+        else:
+            part_of = np.searchsorted(np.cumsum(sizes), won, side='right')
+            offset = 0
+            for i, (size, part) in enumerate(zip(sizes, parts)):
+                sel = part_of == i
+                k = int(np.count_nonzero(sel))
+                if k:
+                    index = self._take('part_won', won, np.flatnonzero(sel))
+                    index -= offset
+                    part_color = self._scratch('part_color', 3 * k, np.float32).reshape(k, 3)
+                    color[sel] = part[3](index, part_color)
+                offset += size
+        # In place, then truncated to uint8 by the assignment as astype would
+        color *= 255
+        color += 0.5
+        np.clip(color, 0, 255, out=color)
+        rgb = self.rgb.reshape(-1, 3)
+        rgb[pixel] = color
+        self._touch(GL_COLOR_BUFFER_BIT, pixel)
+        return self.rgb
+
+# --------- Rendering questions ---------
+_default_renderer = None
+
+def render_question(q, state=None, renderer=None):
+    """Render question q of a SceneState (default: main.scene) to (rgb, depth).
+
+    A given renderer's own framebuffers are returned and reused by the next
+    call; one that is already installed into main and utils is used as is. Without a
+    renderer a shared 1200x800 one is used and copies are returned.
+    """
+    import main
+    global _default_renderer
+
+    state = (state or main.scene).copy()
+    state.current_question = q
+    copy = renderer is None
+    if renderer is None:
+        if _default_renderer is None:
+            _default_renderer = SoftwareRenderer()
+        renderer = _default_renderer
+    if renderer.installed:
+        _render_frame(main, state, renderer)
+    else:
+        # Reinstalling reuses the stubs made by the renderer's first install
+        with renderer.install(main, utils):
+            _render_frame(main, state, renderer)
+    if copy:
+        return renderer.rgb.copy(), renderer.depth.copy()
+    return renderer.rgb, renderer.depth
+
+def _render_frame(main, state, renderer):
+    # init_gl only sets up the projection and fixed state, which the renderer
+    # keeps between frames; main's aspect ratio is shared by all renderers
+    if not renderer.initialized or main.aspect_ratio != renderer.width / renderer.height:
+        main.init_gl((renderer.width, renderer.height))
+        renderer.initialized = True
+    main.draw_frame(state)
+    renderer.finish()
+
+def write_png(path, rgb):
+    """Write an (H, W, 3) uint8 array as an 8-bit RGB PNG"""
+    height, width, _ = rgb.shape
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # filter byte 0 per row
+    raw[:, 1:] = rgb.reshape(height, -1)
+
+    def chunk(tag, data):
+        return (struct.pack('>I', len(data)) + tag + data
+                + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
@@ -0,0 +1,113 @@
+"""Render a question over a sweep of its parameters as a PNG sequence.
+
+    python sweep.py 3 stretch=0.1:5:50 --out frames/q3
+    python sweep.py 10 angle=0:360:120 tx=0:3:120 --workers 8
+    python sweep.py 6 shear=-1:1:40 trans.1=0:3:40
+
+Each range is name=start:stop:count. All ranges advance together, so they
+must have the same count. A trailing .N selects one component of a vector
+parameter. Frames are rendered with the software rasterizer in a process
+pool, and each worker keeps one renderer for all of its frames.
+"""
+import argparse
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from scene_state import SceneState
+
+def parse_range(text):
+    """'name=start:stop:count' or 'name.N=...' -> (name, component or None, values)"""
+    try:
+        name, spec = text.split('=')
+        start, stop, count = spec.split(':')
+        start, stop, count = float(start), float(stop), int(count)
+        component = None
+        if '.' in name:
+            name, index = name.split('.')
+            component = int(index)
+    except ValueError:
+        raise ValueError(f"bad range {text!r}, expected name=start:stop:count or name.N=start:stop:count")
+    if count < 1:
+        raise ValueError(f"bad range {text!r}, the count must be at least 1")
+    return name, component, np.linspace(start, stop, count)
+
+def sweep_states(q, ranges, base=None):
+    """One SceneState per sweep step, showing question q"""
+    counts = {len(values) for _, _, values in ranges}
+    if len(counts) != 1:
+        raise ValueError("all ranges must have the same number of steps")
+    base = (base or SceneState()).copy()
+    base.current_question = q
+    p = base.question(q)
+    fields = type(p).__slots__
+    for name, component, _ in ranges:
+        if name not in fields:
+            raise ValueError(f"question {q} has no parameter {name!r} (choose from {', '.join(fields)})")
+        value = getattr(p, name)
+        if isinstance(value, tuple):
+            if component is None:
+                raise ValueError(f"{name} is a vector, sweep one component with {name}.N "
+                                 f"(N from 0 to {len(value) - 1})")
+            if not 0 <= component < len(value):
+                raise ValueError(f"{name} has components 0 to {len(value) - 1}, not {component}")
+        elif component is not None:
+            raise ValueError(f"{name} is a scalar, it has no component {component}")
+    states = []
+    for step in range(counts.pop()):
+        state = base.copy()
+        p = state.question(q)
+        for name, component, values in ranges:
+            value = float(values[step])
+            if component is None:
+                setattr(p, name, value)
+            else:
+                vector = list(getattr(p, name))
+                vector[component] = value
+                setattr(p, name, tuple(vector))
+        states.append(state)
+    return states
+
+# --------- Worker processes ---------
+_renderer = None
+
+def _init_worker(width, height):
+    global _renderer
+    import main
+    import utils
+    from software_render import SoftwareRenderer
+    _renderer = SoftwareRenderer(width, height).install(main, utils)
+
+def _render_task(task):
+    from software_render import render_question, write_png
+    path, state_dict = task
+    state = SceneState.from_dict(state_dict)
+    rgb, _ = render_question(state.current_question, state, _renderer)
+    write_png(path, rgb)
+    return path
+
+def render_sweep(states, out_dir, workers=None, size=(1200, 800)):
+    """Render each SceneState to out_dir/q{question}_{step:05d}.png; returns the paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(os.path.join(out_dir, f"q{state.current_question}_{i:05d}.png"), state.to_dict())
+             for i, state in enumerate(states)]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (4 * workers))
+    with Pool(workers, initializer=_init_worker, initargs=size) as pool:
+        return list(pool.imap(_render_task, tasks, chunksize=chunksize))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a parameter sweep of one question")
+    parser.add_argument('question', type=int, choices=range(1, 11))
+    parser.add_argument('ranges', nargs='+', metavar='name=start:stop:count')
+    parser.add_argument('--out', default='frames')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--size', type=int, nargs=2, default=(1200, 800), metavar=('W', 'H'))
+    args = parser.parse_args()
+    try:
+        states = sweep_states(args.question, [parse_range(r) for r in args.ranges])
+    except ValueError as e:
+        parser.error(str(e))
+    paths = render_sweep(states, args.out, args.workers, tuple(args.size))
+    print(f"wrote {len(paths)} frames to {args.out}")
@@ -0,0 +1,31 @@
+"""Regression tests for culling.py (run with python -m pytest)."""
+import numpy as np
+import pytest
+
+from culling import (
+    bounding_boxes, bounding_spheres, boxes_visible, frustum_planes, instances_visible,
+    spheres_visible,
+)
+from transforms import look_at_matrices, perspective_matrix
+
+PLANES = frustum_planes(perspective_matrix(45, 1.5, 0.1, 50) @ look_at_matrices((0, 2, 10), (0, 0, 0)))
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64, np.int64])
+def test_instances_visible_matches_both_bounds(dtype):
+    rng = np.random.default_rng(0)
+    matrices = np.zeros((500, 4, 4))
+    matrices[:, :3, :3] = rng.normal(size=(500, 3, 3)) * 0.5
+    matrices[:, :3, 3] = rng.uniform(-40, 40, (500, 3))
+    matrices[:, 3, 3] = 1
+    matrices = matrices.astype(dtype)
+    expected = (spheres_visible(PLANES, *bounding_spheres(matrices))
+                & boxes_visible(PLANES, *bounding_boxes(matrices)))
+    visible = instances_visible(PLANES, matrices)
+    assert visible.any() and not visible.all()
+    assert np.array_equal(visible, expected)
+
+def test_instances_visible_single_matrix():
+    assert instances_visible(PLANES, np.eye(4)).tolist() == [True]
+    behind = np.eye(4)
+    behind[2, 3] = 30
+    assert instances_visible(PLANES, behind).tolist() == [False]
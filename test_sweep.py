@@ -0,0 +1,26 @@
+"""Regression tests for sweep.py (run with python -m pytest)."""
+import pytest
+
+from sweep import parse_range, sweep_states
+
+def test_sweep_sets_scalar_and_component():
+    states = sweep_states(6, [parse_range('shear=-1:1:3'), parse_range('trans.1=0:4:3')])
+    assert [s.question(6).shear for s in states] == [-1, 0, 1]
+    assert [s.question(6).trans for s in states] == [(-2, 0, 1), (-2, 2, 1), (-2, 4, 1)]
+    assert all(s.current_question == 6 for s in states)
+
+@pytest.mark.parametrize('text', ['stretch', 'stretch=0:1', 'stretch=a:1:2', 'stretch=0:1:2.5',
+                                  'trans.x=0:1:2', 'trans.0.1=0:1:2', 'stretch=1:2:0', 'stretch=1:2:-3'])
+def test_parse_range_rejects_malformed(text):
+    with pytest.raises(ValueError, match='bad range'):
+        parse_range(text)
+
+@pytest.mark.parametrize('q, text', [(6, 'trans=0:1:2'), (3, 'stretch.0=0:1:2'), (6, 'trans.3=0:1:2'),
+                                     (6, 'trans.-1=0:1:2'), (3, 'speed=0:1:2')])
+def test_sweep_states_rejects_bad_parameter(q, text):
+    with pytest.raises(ValueError):
+        sweep_states(q, [parse_range(text)])
+
+def test_sweep_states_rejects_mismatched_counts():
+    with pytest.raises(ValueError, match='same number'):
+        sweep_states(6, [parse_range('shear=0:1:2'), parse_range('taper=0:1:3')])
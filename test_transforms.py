@@ -0,0 +1,77 @@
+"""Regression tests for transforms.py (run with python -m pytest)."""
+import numpy as np
+import pytest
+
+from transforms import (
+    angle_directions, look_at_matrices, question_matrix, reflect_points, reflection_matrices,
+    stretch_matrices, stretch_points,
+)
+
+def _check_view(matrix, eye):
+    rotation = matrix[:3, :3]
+    assert np.all(np.isfinite(matrix))
+    assert np.allclose(rotation @ rotation.T, np.eye(3))
+    # The eye is the origin of view space
+    assert np.allclose(rotation @ eye + matrix[:3, 3], 0)
+
+def test_look_at_matches_gluLookAt():
+    m = look_at_matrices((0, 1, 8), (0, 0, 0), (0, 1, 0))
+    forward = np.array([0, -1, -8]) / np.sqrt(65)
+    assert np.allclose(m[2, :3], -forward)
+    _check_view(m, np.array([0, 1, 8]))
+
+@pytest.mark.parametrize('eye', [(0, 1, 0), (0, -3, 0), (0, 0.5, 0)])
+def test_look_at_up_parallel_to_view(eye):
+    # Q2 after pressing W 16 times: looking straight down the up axis
+    m = look_at_matrices(eye, (0, 0, 0), (0, 1, 0))
+    assert m.shape == (4, 4)
+    _check_view(m, np.array(eye, dtype=float))
+
+def test_look_at_zero_up():
+    _check_view(look_at_matrices((1, 2, 3), (0, 0, 0), (0, 0, 0)), np.array([1, 2, 3]))
+
+def test_look_at_eye_at_center():
+    # Q2 after DOWN twice and W 16 times: the camera sits on the look point
+    m = look_at_matrices((0, 0, 0), (0, 0, 0), (0, 1, 0))
+    assert np.allclose(m, np.eye(4))
+    m = look_at_matrices((1, 2, 3), (1, 2, 3), (0, 1, 0))
+    assert np.allclose(m[:3, :3], np.eye(3))
+    _check_view(m, np.array([1, 2, 3]))
+
+def test_look_at_batch_with_degenerate_rows():
+    eyes = np.array([[0, 1, 8], [0, 1, 0], [0, 0, 0]], dtype=float)
+    batch = look_at_matrices(eyes, (0, 0, 0), (0, 1, 0))
+    assert batch.shape == (3, 4, 4)
+    for eye, matrix in zip(eyes, batch):
+        assert np.allclose(matrix, look_at_matrices(eye, (0, 0, 0), (0, 1, 0)))
+
+def test_question_matrix_matches_dense_product():
+    # Q6: T @ Ry @ Sz @ Tyz @ Sxz as written out in Question6.py
+    shear, taper, scale_z, angle, trans = 0.5, 0.2, 3, 45, (-2, 3, 1)
+    c, s = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+    Sxz = np.array([[1, shear, 0, 0], [0, 1, 0, 0], [0, shear, 1, 0], [0, 0, 0, 1]])
+    Tyz = np.array([[1, 0, 0, 0], [0, 1, taper, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
+    Sz = np.diag([1, 1, scale_z, 1])
+    Ry = np.array([[c, 0, s, 0], [0, 1, 0, 0], [-s, 0, c, 0], [0, 0, 0, 1]])
+    T = np.eye(4)
+    T[:3, 3] = trans
+    M = question_matrix(6, (shear, taper, scale_z, angle, trans))
+    assert np.allclose(M, T @ Ry @ Sz @ Tyz @ Sxz)
+    assert not M.flags.writeable
+
+@pytest.mark.parametrize('reflect', [lambda lines: reflect_points([(1, 2)], lines), reflection_matrices])
+def test_reflection_rejects_zero_normal(reflect):
+    with pytest.raises(ValueError, match='non-zero'):
+        reflect([(1, -1, 3), (0, 0, 1)])
+
+@pytest.mark.parametrize('directions, factors', [
+    ((1, 1), [0.5, 2, 3]),                      # one direction, many factors
+    (angle_directions([0, 45, 90]), 2),         # many directions, one factor
+    (angle_directions([0, 45, 90]), [0.5, 2, 3]),
+])
+def test_stretch_points_broadcasts_like_stretch_matrices(directions, factors):
+    points = np.array([[1.0, 0.0], [0.0, 2.0], [-1.0, 1.0]])
+    matrices = stretch_matrices(directions, factors).reshape(-1, 2, 2)
+    stretched = stretch_points(points, directions, factors)
+    assert stretched.shape == (len(matrices), len(points), 2)
+    assert np.allclose(stretched, points @ matrices.transpose(0, 2, 1))
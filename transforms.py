@@ -0,0 +1,417 @@
+"""Affine transform helpers shared by main.py and the Question scripts."""
+from functools import lru_cache
+from math import sin, cos, radians
+
+import numpy as np
+
+_AXIS_INDEX = {'x': 0, 'y': 1, 'z': 2}
+
+# --------- Compact affine matrices ---------
+class Affine:
+    """Affine transform stored as the 3x4 block [L | t] of a 4x4 matrix.
+
+    The implicit last row is always [0, 0, 0, 1]. `data` may also be a stack
+    of shape (..., 3, 4), in which case every operation broadcasts over the
+    leading dimensions.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data, dtype=None):
+        data = np.asarray(data, dtype=dtype)
+        if data.shape[-2:] == (4, 4):
+            data = data[..., :3, :]
+        if data.shape[-2:] != (3, 4):
+            raise ValueError(f"expected (..., 3, 4) or (..., 4, 4) data, got {data.shape}")
+        if data.dtype.kind != 'f':
+            data = data.astype(np.float64)
+        self.data = np.ascontiguousarray(data)
+
+    @classmethod
+    def identity(cls, dtype=np.float64):
+        data = np.zeros((3, 4), dtype=dtype)
+        data[0, 0] = data[1, 1] = data[2, 2] = 1
+        return cls(data)
+
+    @property
+    def linear(self):
+        return self.data[..., :3]
+
+    @property
+    def translation(self):
+        return self.data[..., 3]
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def astype(self, dtype):
+        return Affine(self.data.astype(dtype))
+
+    def matrix(self):
+        """Full 4x4 homogeneous matrix (or stack of them)"""
+        matrix = np.zeros(self.data.shape[:-2] + (4, 4), dtype=self.dtype)
+        matrix[..., :3, :] = self.data
+        matrix[..., 3, 3] = 1
+        return matrix
+
+    def __matmul__(self, other):
+        """Composition: (A @ B).apply(p) == A.apply(B.apply(p))"""
+        if not isinstance(other, Affine):
+            return NotImplemented
+        linear = np.matmul(self.linear, other.linear)
+        data = np.empty(linear.shape[:-2] + (3, 4), dtype=linear.dtype)
+        data[..., :3] = linear
+        data[..., 3] = np.matmul(self.linear, other.translation[..., None])[..., 0] + self.translation
+        return Affine(data)
+
+    def is_rigid(self, atol=1e-6):
+        """True if every linear part is orthonormal (rotation/reflection only)"""
+        gram = np.matmul(self.linear, np.swapaxes(self.linear, -1, -2))
+        return bool(np.allclose(gram, np.eye(3), atol=atol))
+
+    def inverse(self, rigid=None):
+        """Closed-form inverse; rigid transforms just transpose their rotation"""
+        if rigid is None:
+            rigid = self.is_rigid()
+        linear = self.linear
+        if rigid:
+            inv_linear = np.swapaxes(linear, -1, -2)
+        else:
+            # Adjugate formula: the columns of the inverse are cross products of rows
+            r0, r1, r2 = linear[..., 0, :], linear[..., 1, :], linear[..., 2, :]
+            cofactors = np.stack([np.cross(r1, r2), np.cross(r2, r0), np.cross(r0, r1)], axis=-1)
+            det = np.sum(r0 * cofactors[..., :, 0], axis=-1)
+            if np.any(det == 0):
+                raise np.linalg.LinAlgError("affine transform is singular")
+            inv_linear = cofactors / det[..., None, None]
+        data = np.empty_like(self.data)
+        data[..., :3] = inv_linear
+        data[..., 3] = -np.matmul(inv_linear, self.translation[..., None])[..., 0]
+        return Affine(data)
+
+    def apply(self, points, out=None):
+        """Transform (..., N, 3) points; a stack of M affines gives (M, N, 3)"""
+        points = np.asarray(points)
+        linear_t = np.swapaxes(self.linear, -1, -2)
+        if points.dtype != self.dtype:
+            points = points.astype(np.result_type(points.dtype, self.dtype))
+        out = np.matmul(points, linear_t, out=out)
+        out += self.translation[..., None, :]
+        return out
+
+    def __repr__(self):
+        return f"Affine({self.data!r})"
+
+# --------- Transform chains ---------
+class TransformChain:
+    """Sequence of elementary transforms fused into a single 3x4 affine.
+
+    Operations apply in the order they are added, so
+
+        TransformChain().shear_xz_by_y(0.5).scale(1, 1, 3).translate(-2, 3, 1)
+
+    is the matrix T @ Sz @ Sxz. Each step is folded into the 3x4 result
+    with the few row operations its sparse matrix implies instead of a
+    dense 4x4 product.
+    """
+
+    def __init__(self):
+        self._ops = []
+        self._affine = None
+
+    def _add(self, op, *args):
+        self._ops.append((op, args))
+        self._affine = None
+        return self
+
+    # Elementary operations
+    def shear(self, target, source, factor):
+        """target += factor * source, e.g. shear('x', 'y', f) for x' = x + f*y"""
+        return self._add('shear', _AXIS_INDEX[target], _AXIS_INDEX[source], factor)
+
+    def shear_xz_by_y(self, factor=0.5):
+        return self.shear('x', 'y', factor).shear('z', 'y', factor)
+
+    def taper_y_by_z(self, factor=0.2):
+        return self.shear('y', 'z', factor)
+
+    def scale(self, sx, sy=None, sz=None):
+        if sy is None:
+            sy = sz = sx
+        return self._add('scale', sx, sy, sz)
+
+    def rotate(self, degrees, axis):
+        return self._add('rotate', degrees, _AXIS_INDEX[axis])
+
+    def translate(self, dx, dy, dz):
+        return self._add('translate', dx, dy, dz)
+
+    def __len__(self):
+        return len(self._ops)
+
+    # Fusion
+    def compile(self, dtype=np.float64):
+        """The fused (3,4) affine [A | t] of the whole chain"""
+        if self._affine is None or self._affine.dtype != dtype:
+            affine = np.zeros((3, 4), dtype=dtype)
+            affine[0, 0] = affine[1, 1] = affine[2, 2] = 1
+            for op, args in self._ops:
+                _FOLD[op](affine, *args)
+            affine.flags.writeable = False
+            self._affine = affine
+        return self._affine
+
+    def affine(self, dtype=np.float64):
+        """The fused chain as an Affine"""
+        return Affine(self.compile(dtype))
+
+    def matrix(self, dtype=np.float64):
+        """The fused chain as a 4x4 homogeneous matrix"""
+        matrix = np.eye(4, dtype=dtype)
+        matrix[:3] = self.compile(dtype)
+        return matrix
+
+    def apply(self, points, out=None):
+        """Transform (N,3) points with one matmul-and-add pass"""
+        points = np.asarray(points)
+        dtype = points.dtype if points.dtype.kind == 'f' else np.float64
+        affine = self.compile(dtype)
+        out = np.matmul(points, affine[:, :3].T, out=out)
+        out += affine[:, 3]
+        return out
+
+# Each fold applies one elementary matrix on the left of the accumulator
+def _fold_shear(affine, target, source, factor):
+    affine[target] += factor * affine[source]
+
+def _fold_scale(affine, sx, sy, sz):
+    affine[0] *= sx
+    affine[1] *= sy
+    affine[2] *= sz
+
+def _fold_rotate(affine, degrees, axis):
+    t = radians(degrees)
+    c, s = cos(t), sin(t)
+    # Rows (i, j) rotate like (x, y) about z; cyclic order keeps the sign right
+    i, j = ((1, 2), (2, 0), (0, 1))[axis]
+    row_i = affine[i].copy()
+    affine[i] = c * row_i - s * affine[j]
+    affine[j] = s * row_i + c * affine[j]
+
+def _fold_translate(affine, dx, dy, dz):
+    affine[0, 3] += dx
+    affine[1, 3] += dy
+    affine[2, 3] += dz
+
+_FOLD = {
+    'shear': _fold_shear,
+    'scale': _fold_scale,
+    'rotate': _fold_rotate,
+    'translate': _fold_translate,
+}
+
+# --------- Reflections over 2D lines ---------
+# Lines are stored in normal form a*x + b*y + c = 0 as (L, 3) arrays, which
+# covers vertical lines that y = m*x + b cannot represent.
+def lines_from_slope_intercept(m, b):
+    """Lines y = m*x + b for arrays of slopes and intercepts"""
+    m, b = np.broadcast_arrays(np.asarray(m, dtype=float), np.asarray(b, dtype=float))
+    return np.stack([m, -np.ones_like(m), b], axis=-1).reshape(-1, 3)
+
+def vertical_lines(x):
+    """Lines x = const for an array of x positions"""
+    x = np.asarray(x, dtype=float).reshape(-1)
+    return np.stack([np.ones_like(x), np.zeros_like(x), -x], axis=-1)
+
+def _normal_norms_sq(normal):
+    """Squared lengths of (L, 2) line normals, which must be non-zero"""
+    norm_sq = np.einsum('lk,lk->l', normal, normal)
+    if np.any(norm_sq == 0):
+        raise ValueError("line normals (a, b) must be non-zero")
+    return norm_sq
+
+def reflect_points(points, lines, out=None, dtype=np.float64):
+    """Reflect (N,2) points over (L,3) lines, giving an (L, N, 2) array.
+
+    Only one (L, N) temporary is allocated besides the result, which can be
+    passed in as `out` (e.g. a float32 buffer for very large L*N).
+    """
+    points = np.asarray(points, dtype=dtype).reshape(-1, 2)
+    lines = np.asarray(lines, dtype=dtype).reshape(-1, 3)
+    normal = lines[:, :2]
+    norm_sq = _normal_norms_sq(normal)
+    if out is None:
+        out = np.empty((len(lines), len(points), 2), dtype=dtype)
+    # Signed distance along the normal, scaled so p' = p - k * n
+    k = normal @ points.T                    # (L, N)
+    k += lines[:, 2, None]
+    k *= (2 / norm_sq)[:, None]
+    for axis in (0, 1):
+        np.multiply(k, normal[:, axis, None], out=out[..., axis])
+        np.subtract(points[:, axis], out[..., axis], out=out[..., axis])
+    return out
+
+def reflection_matrices(lines):
+    """(L, 3, 3) homogeneous 2D matrices reflecting over each line"""
+    lines = np.asarray(lines, dtype=float).reshape(-1, 3)
+    normal = lines[:, :2]
+    scale = 2 / _normal_norms_sq(normal)
+    matrices = np.zeros((len(lines), 3, 3))
+    matrices[:, :2, :2] = np.eye(2) - scale[:, None, None] * normal[:, :, None] * normal[:, None, :]
+    matrices[:, :2, 2] = -(scale * lines[:, 2])[:, None] * normal
+    matrices[:, 2, 2] = 1
+    return matrices
+
+# --------- Directional stretches ---------
+# Stretching by k along a unit direction u is I + (k - 1) u u^T, the closed
+# form of rotate-to-axis @ scale-axis @ rotate-back.
+def clock_points(n=12, radius=1.0, dtype=np.float64):
+    """(n, 2) points on a circle, clockwise from 12 o'clock like a clock face"""
+    angles = np.radians(90 - np.arange(n) * (360 / n))
+    points = np.empty((n, 2), dtype=dtype)
+    np.cos(angles, out=points[:, 0])
+    np.sin(angles, out=points[:, 1])
+    points *= radius
+    return points
+
+def angle_directions(degrees, dtype=np.float64):
+    """Unit 2D directions (..., 2) for angles in degrees"""
+    t = np.radians(np.asarray(degrees, dtype=dtype))
+    return np.stack([np.cos(t), np.sin(t)], axis=-1)
+
+def _unit_directions(directions, dtype):
+    directions = np.asarray(directions, dtype=dtype)
+    norm = np.linalg.norm(directions, axis=-1, keepdims=True)
+    if np.any(norm == 0):
+        raise ValueError("stretch directions must be non-zero")
+    return directions / norm
+
+def stretch_matrices(directions, factors, dtype=np.float64):
+    """(..., d, d) matrices stretching by factors along 2D or 3D directions.
+
+    directions (..., d) need not be unit length; they broadcast against
+    factors (...). Use angle_directions for the 2D angle form.
+    """
+    u = _unit_directions(directions, dtype)
+    k = np.asarray(factors, dtype=dtype) - 1
+    d = u.shape[-1]
+    return np.eye(d, dtype=dtype) + k[..., None, None] * u[..., :, None] * u[..., None, :]
+
+def stretch_points(points, directions, factors, out=None, dtype=np.float64):
+    """Stretch (N, d) points along directions by factors -> (M, N, d).
+
+    directions (..., d) broadcast against factors (...) as in
+    stretch_matrices, giving M stretches (one direction with many factors or
+    the reverse). Works as p + (k - 1) (p . u) u, so no matrices are formed
+    and the only temporary is one (M, N) array.
+    """
+    points = np.asarray(points, dtype=dtype)
+    d = points.shape[-1]
+    points = points.reshape(-1, d)
+    u = _unit_directions(directions, dtype)
+    k = np.asarray(factors, dtype=dtype) - 1
+    shape = np.broadcast_shapes(u.shape[:-1], k.shape)
+    u = np.broadcast_to(u, shape + (d,)).reshape(-1, d)
+    k = np.broadcast_to(k, shape).reshape(-1)
+    if out is None:
+        out = np.empty((len(u), len(points), d), dtype=dtype)
+    along = u @ points.T                     # (M, N)
+    along *= k[:, None]
+    for axis in range(d):
+        np.multiply(along, u[:, axis, None], out=out[..., axis])
+        np.add(points[:, axis], out[..., axis], out=out[..., axis])
+    return out
+
+# --------- Camera matrices ---------
+def look_at_matrices(eye, center, up=(0.0, 1.0, 0.0), dtype=np.float64):
+    """(..., 4, 4) view matrices equal to what gluLookAt multiplies on.
+
+    eye, center and up are (..., 3) and broadcast, so a whole camera path
+    is one call. Where up is zero or parallel to the view direction, the
+    world axis least aligned with the view is used as up instead. Where eye
+    equals center there is no view direction; the camera then sits at eye
+    looking down -z, as the identity view does.
+    """
+    eye, center, up = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (eye, center, up)))
+    shape = eye.shape[:-1]
+    # Work on (N, 3) rows so single poses and batches take the same path
+    eye, center, up = (v.reshape(-1, 3) for v in (eye, center, up))
+    forward = center - eye
+    distance = np.linalg.norm(forward, axis=-1)
+    coincident = distance == 0
+    forward[coincident] = (0.0, 0.0, -1.0)
+    distance[coincident] = 1.0
+    forward /= distance[:, None]
+    side = np.cross(forward, up)
+    length = np.linalg.norm(side, axis=-1)
+    degenerate = length <= 1e-9 * np.linalg.norm(up, axis=-1)
+    if np.any(degenerate):
+        f = forward[degenerate]
+        fallback = np.eye(3)[np.argmin(np.abs(f), axis=-1)]
+        side[degenerate] = np.cross(f, fallback)
+        length[degenerate] = np.linalg.norm(side[degenerate], axis=-1)
+    side /= length[:, None]
+    matrices = np.zeros((len(eye), 4, 4))
+    matrices[:, 0, :3] = side
+    matrices[:, 1, :3] = np.cross(side, forward)
+    matrices[:, 2, :3] = -forward
+    matrices[:, :3, 3] = -np.einsum('nij,nj->ni', matrices[:, :3, :3], eye)
+    matrices[:, 3, 3] = 1
+    return matrices.reshape(shape + (4, 4)).astype(dtype, copy=False)
+
+def perspective_matrix(fovy, aspect, near, far):
+    """The matrix gluPerspective multiplies onto the current matrix"""
+    f = 1.0 / np.tan(np.radians(fovy) / 2)
+    return np.array([
+        [f / aspect, 0, 0, 0],
+        [0, f, 0, 0],
+        [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+        [0, 0, -1, 0],
+    ])
+
+def column_major(matrices, dtype=np.float32):
+    """Contiguous column-major copy of (..., 4, 4) matrices for glLoadMatrixf"""
+    return np.ascontiguousarray(np.swapaxes(matrices, -1, -2), dtype=dtype)
+
+# --------- Cached question matrices ---------
+# Each question's composite is folded by a TransformChain and memoized on
+# its parameter tuple (SceneState.question(q).values()), so an unchanged
+# frame builds no matrices. The returned arrays are shared and therefore
+# read-only.
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+IDENTITY = _frozen(np.eye(4))
+
+def question_chain(q, state):
+    """TransformChain of question 1, 5, 6, 8, 9 or 10 for its parameter tuple"""
+    chain = TransformChain()
+    if q == 1:
+        # Same order as the glTranslatef/glRotatef/glScalef calls in draw_question
+        translation, angle, scale = state
+        chain.scale(*scale).rotate(angle, 'z').translate(*translation)
+    elif q == 5:
+        (a,) = state
+        # M = R2 @ T2 @ R1 @ T1
+        chain.translate(0, a, 0).rotate(90, 'x').translate(0, 0, a).rotate(90, 'y')
+    elif q == 6:
+        shear, taper, scale_z, angle, trans = state
+        # M = T @ Ry @ Sz @ Tyz @ Sxz
+        chain.shear_xz_by_y(shear).taper_y_by_z(taper).scale(1, 1, scale_z).rotate(angle, 'y').translate(*trans)
+    elif q == 8:
+        chain.scale(*state)
+    elif q == 9:
+        (angle,) = state
+        chain.rotate(angle, 'y')
+    elif q == 10:
+        sx, sy, sz, angle, tx, ty, tz = state
+        chain.scale(sx, sy, sz).rotate(angle, 'z').translate(tx, ty, tz)
+    else:
+        raise ValueError(f"question {q} has no composite matrix")
+    return chain
+
+@lru_cache(maxsize=64)
+def question_matrix(q, state):
+    """Composite 4x4 matrix of question_chain(q, state)"""
+    return _frozen(question_chain(q, state).matrix())
@@ -1,66 +1,215 @@
+import ctypes
+from collections import OrderedDict
+
 import numpy as np
 from OpenGL.GL import *
 
-def draw_cube(size=1.0):
+from lod import LODLadder, LODSelector, projected_radius
+from mesh_cache import MeshCache, default_cache_dir
+
+# --------- Mesh generation (no GL required) ---------
+# Trig is evaluated once per ring and once per slice and combined with
+# broadcasting, so even 2048x2048 tessellations build in milliseconds.
+def _grid_indices(rows, cols, first=0):
+    """Two triangles per cell of a (rows+1) x (cols+1) vertex grid"""
+    base = (np.arange(rows, dtype=np.uint32)[:, None] * (cols + 1)
+            + np.arange(cols, dtype=np.uint32)[None, :] + first)
+    corners = np.array([0, cols + 1, 1, 1, cols + 1, cols + 2], dtype=np.uint32)
+    return (base[..., None] + corners).reshape(-1)
+
+def sphere_mesh(radius=1.0, slices=16, stacks=16, dtype=np.float32):
+    """Positions (V,3), normals (V,3) and triangle indices of a UV sphere"""
+    lat = np.pi * (-0.5 + np.arange(stacks + 1) / stacks)
+    lng = 2 * np.pi * np.arange(slices + 1) / slices
+    normals = np.empty((stacks + 1, slices + 1, 3), dtype=dtype)
+    cos_lat = np.cos(lat)[:, None]
+    np.multiply(cos_lat, np.cos(lng), out=normals[..., 0])
+    np.multiply(cos_lat, np.sin(lng), out=normals[..., 1])
+    normals[..., 2] = np.sin(lat)[:, None]
+    normals = normals.reshape(-1, 3)
+    positions = (normals * radius).astype(dtype, copy=False)
+    return positions, normals, _grid_indices(stacks, slices)
+
+def cylinder_mesh(radius=0.4, height=0.2, slices=32, dtype=np.float32):
+    """Positions (V,3), normals (V,3) and triangle indices of a capped cylinder"""
+    angle = 2 * np.pi * np.arange(slices + 1) / slices
+    ring = np.zeros((slices + 1, 3), dtype=dtype)
+    ring[:, 0] = np.cos(angle)
+    ring[:, 1] = np.sin(angle)
+    n = slices + 1
+    positions = np.empty((4 * n + 2, 3), dtype=dtype)
+    normals = np.empty_like(positions)
+    # Side: bottom ring then top ring, normals pointing outwards
+    positions[:n] = ring * radius
+    positions[n:2 * n] = positions[:n]
+    positions[n:2 * n, 2] = height
+    normals[:n] = ring
+    normals[n:2 * n] = ring
+    # Caps: a centre vertex followed by its own ring, normals along +-z
+    for first, z, nz in ((2 * n, height, 1.0), (3 * n + 1, 0.0, -1.0)):
+        positions[first] = (0.0, 0.0, z)
+        positions[first + 1:first + 1 + n] = positions[:n]
+        positions[first + 1:first + 1 + n, 2] = z
+        normals[first:first + 1 + n] = (0.0, 0.0, nz)
+    side = _grid_indices(1, slices)
+    rim = np.arange(slices, dtype=np.uint32)
+    caps = []
+    for centre in (2 * n, 3 * n + 1):
+        caps.append(np.stack([np.full(slices, centre, dtype=np.uint32),
+                              centre + 1 + rim, centre + 2 + rim], axis=-1).reshape(-1))
+    return positions, normals, np.concatenate([side] + caps)
+
+# --------- Cached vertex-array geometry ---------
+# Each primitive is built once as an interleaved float32 array with one
+# row (x, y, z, nx, ny, nz) per vertex plus an optional index array, and
+# drawn with a single glDrawArrays/glDrawElements call. With a MeshCache
+# the arrays are also kept on disk and memory-mapped by later runs.
+GEOMETRY_VERSION = 1    # Bump when a builder's output changes
+
+def _interleave(positions, normals):
+    return np.hstack([positions, normals])
+
+def _build_cube(size, slices, stacks):
     hs = size / 2.0
-    vertices = [
+    vertices = np.array([
         [ hs, hs, hs], [ hs,-hs, hs], [-hs,-hs, hs], [-hs, hs, hs], # front
         [ hs, hs,-hs], [ hs,-hs,-hs], [-hs,-hs,-hs], [-hs, hs,-hs], # back
-    ]
-    faces = [
+    ])
+    faces = np.array([
         [0,1,2,3], [4,5,6,7], [0,4,5,1],
         [3,7,6,2], [0,4,7,3], [1,5,6,2]
-    ]
-    glBegin(GL_QUADS)
-    for face in faces:
-        for v in face:
-            glVertex3fv(vertices[v])
-    glEnd()
-
-def draw_sphere(radius=1.0, slices=16, stacks=16):
-    for i in range(stacks):
-        lat0 = np.pi * (-0.5 + float(i) / stacks)
-        z0  = radius * np.sin(lat0)
-        zr0 = radius * np.cos(lat0)
-
-        lat1 = np.pi * (-0.5 + float(i+1) / stacks)
-        z1 = radius * np.sin(lat1)
-        zr1 = radius * np.cos(lat1)
-
-        glBegin(GL_QUAD_STRIP)
-        for j in range(slices+1):
-            lng = 2 * np.pi * float(j) / slices
-            x = np.cos(lng)
-            y = np.sin(lng)
-            glVertex3f(x * zr0, y * zr0, z0)
-            glVertex3f(x * zr1, y * zr1, z1)
-        glEnd()
-
-def draw_cylinder(radius=0.4, height=0.2, slices=32):
-    glBegin(GL_QUAD_STRIP)
-    for i in range(slices+1):
-        angle = 2 * np.pi * i / slices
-        x = np.cos(angle) * radius
-        y = np.sin(angle) * radius
-        glVertex3f(x, y, 0)
-        glVertex3f(x, y, height)
-    glEnd()
-    glBegin(GL_TRIANGLE_FAN)
-    glVertex3f(0, 0, height)
-    for i in range(slices+1):
-        angle = 2 * np.pi * i / slices
-        x = np.cos(angle) * radius
-        y = np.sin(angle) * radius
-        glVertex3f(x, y, height)
-    glEnd()
-    glBegin(GL_TRIANGLE_FAN)
-    glVertex3f(0, 0, 0)
-    for i in range(slices+1):
-        angle = 2 * np.pi * i / slices
-        x = np.cos(angle) * radius
-        y = np.sin(angle) * radius
-        glVertex3f(x, y, 0)
-    glEnd()
+    ])
+    positions = vertices[faces]
+    # The centre of each face points along its normal
+    normals = positions.mean(axis=1, keepdims=True) / hs
+    normals = np.broadcast_to(normals, positions.shape)
+    return _interleave(positions.reshape(-1, 3), normals.reshape(-1, 3)), None
+
+def _build_sphere(radius, slices, stacks):
+    positions, normals, indices = sphere_mesh(radius, slices, stacks)
+    return _interleave(positions, normals), indices
+
+def _build_cylinder(size, slices, stacks):
+    positions, normals, indices = cylinder_mesh(*size, slices)
+    return _interleave(positions, normals), indices
+
+# primitive -> (GL mode, builder(size, slices, stacks) -> (vertices, indices or None))
+_GEOMETRY_BUILDERS = {
+    'cube': (GL_QUADS, _build_cube),
+    'sphere': (GL_TRIANGLES, _build_sphere),
+    'cylinder': (GL_TRIANGLES, _build_cylinder),
+}
+
+def _build_geometry(primitive, size, slices, stacks):
+    vertices, indices = _GEOMETRY_BUILDERS[primitive][1](size, slices, stacks)
+    if indices is not None:
+        indices = np.ascontiguousarray(indices, dtype=np.uint32)
+    return np.ascontiguousarray(vertices, dtype=np.float32), indices
+
+class GeometryCache:
+    """LRU cache of interleaved vertex arrays keyed by (primitive, size, slices, stacks).
+
+    With a MeshCache as `disk`, misses are looked up on disk before being
+    built, and newly built arrays are written there for later runs.
+    """
+
+    def __init__(self, maxsize=32, disk=None):
+        self.maxsize = maxsize
+        self.disk = disk
+        self._entries = OrderedDict()
+
+    def get(self, primitive, size, slices=None, stacks=None):
+        key = (primitive, size, slices, stacks)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        mode = _GEOMETRY_BUILDERS[primitive][0]
+        if self.disk is None:
+            vertices, indices = _build_geometry(*key)
+        else:
+            vertices, indices = self.disk.get(primitive, key[1:], lambda: _build_geometry(*key),
+                                              GEOMETRY_VERSION)
+        entry = (mode, vertices, indices)
+        self._entries[key] = entry
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+_mesh_cache_dir = default_cache_dir()     # Meshes go to disk only when MESH_CACHE_DIR is set
+geometry_cache = GeometryCache(disk=MeshCache(_mesh_cache_dir) if _mesh_cache_dir else None)
+
+def draw_vertex_array(mode, vertices, indices=None):
+    """Draw an interleaved (x, y, z, nx, ny, nz) float32 array in one call"""
+    stride = vertices.strides[0]
+    address = vertices.ctypes.data
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_NORMAL_ARRAY)
+    glVertexPointer(3, GL_FLOAT, stride, ctypes.c_void_p(address))
+    glNormalPointer(GL_FLOAT, stride, ctypes.c_void_p(address + 3 * vertices.itemsize))
+    if indices is None:
+        glDrawArrays(mode, 0, len(vertices))
+    else:
+        glDrawElements(mode, len(indices), GL_UNSIGNED_INT, indices)
+    glDisableClientState(GL_NORMAL_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+def draw_cube(size=1.0):
+    draw_vertex_array(*geometry_cache.get('cube', size))
+
+def draw_sphere(radius=1.0, slices=None, stacks=16):
+    """Sphere with the given tessellation, or one picked by draw_sphere_lod"""
+    if slices is None:
+        draw_sphere_lod(radius)
+    else:
+        draw_vertex_array(*geometry_cache.get('sphere', radius, slices, stacks))
+
+def draw_cylinder(radius=0.4, height=0.2, slices=None):
+    """Cylinder with the given slices, or as many as draw_cylinder_lod picks"""
+    if slices is None:
+        draw_cylinder_lod(radius, height)
+    else:
+        draw_vertex_array(*geometry_cache.get('cylinder', (radius, height), slices))
+
+# --------- Level of detail ---------
+# draw_sphere_lod/draw_cylinder_lod pick the tessellation from how large the
+# object appears under the current GL matrices. Objects are told apart by
+# `key` for hysteresis; call begin_lod_frame() once per frame so the vertex
+# budgets apply per frame. The levels are cheap to build and many, so they
+# are cached in memory only, never written to the disk cache.
+LOD_VERTEX_BUDGET = 200_000     # Per selector and frame
+sphere_lod = LODSelector(LODLadder.for_sphere(), vertex_budget=LOD_VERTEX_BUDGET)
+cylinder_lod = LODSelector(LODLadder.for_cylinder(), vertex_budget=LOD_VERTEX_BUDGET)
+lod_geometry_cache = GeometryCache(maxsize=64)
+
+def begin_lod_frame():
+    sphere_lod.begin_frame()
+    cylinder_lod.begin_frame()
+
+def current_view():
+    """Row-major modelview and projection matrices and the viewport height"""
+    modelview = np.asarray(glGetFloatv(GL_MODELVIEW_MATRIX), dtype=float).reshape(4, 4).T
+    projection = np.asarray(glGetFloatv(GL_PROJECTION_MATRIX), dtype=float).reshape(4, 4).T
+    return modelview, projection, int(glGetIntegerv(GL_VIEWPORT)[3])
+
+def draw_sphere_lod(radius=1.0, key=None, view=None):
+    """draw_sphere with slices/stacks chosen by projected size; view defaults to current_view()"""
+    pixels = projected_radius((0, 0, 0), radius, *(view or current_view()))
+    slices, stacks = sphere_lod.select(('sphere', radius) if key is None else key, pixels)
+    draw_vertex_array(*lod_geometry_cache.get('sphere', radius, slices, stacks))
+
+def draw_cylinder_lod(radius=0.4, height=0.2, key=None, view=None):
+    """draw_cylinder with slices chosen by projected size; view defaults to current_view()"""
+    bound = np.hypot(radius, height / 2)
+    pixels = projected_radius((0, 0, height / 2), bound, *(view or current_view()))
+    slices = cylinder_lod.select(('cylinder', radius, height) if key is None else key, pixels)
+    draw_vertex_array(*lod_geometry_cache.get('cylinder', (radius, height), slices))
 
 def translate(matrix, translation_vector):
     translation_matrix = np.array([
@@ -105,4 +254,117 @@ def scale(matrix, scale_vector):
         [0, 0, scale_vector[2], 0],
         [0, 0, 0, 1]
     ])
-    return scaling_matrix @ matrix
\ No newline at end of file
+    return scaling_matrix @ matrix
+
+# --------- Batched transforms: (N,4,4) stacks ---------
+_AXIS_VECTORS = {
+    'x': (1.0, 0.0, 0.0),
+    'y': (0.0, 1.0, 0.0),
+    'z': (0.0, 0.0, 1.0),
+}
+
+def _matrix_stack(n, out):
+    if out is None:
+        return np.empty((n, 4, 4))
+    if out.shape != (n, 4, 4):
+        raise ValueError(f"out must have shape {(n, 4, 4)}, got {out.shape}")
+    return out
+
+def _identity_stack(n, out):
+    out = _matrix_stack(n, out)
+    out[...] = 0.0
+    out[:, [0, 1, 2, 3], [0, 1, 2, 3]] = 1.0
+    return out
+
+def translation_matrices(translation_vectors, out=None):
+    """Stack of 4x4 translation matrices, one per row of an (N,3) array"""
+    t = np.asarray(translation_vectors, dtype=float).reshape(-1, 3)
+    out = _identity_stack(len(t), out)
+    out[:, :3, 3] = t
+    return out
+
+def rotation_matrices(angles, axis, out=None):
+    """Stack of 4x4 rotation matrices (angles in degrees).
+
+    `axis` is 'x', 'y', 'z', a single 3-vector or an (N,3) array of axes;
+    arbitrary axes are normalized and use Rodrigues' formula.
+    """
+    angle_rad = np.radians(np.asarray(angles, dtype=float))
+    if isinstance(axis, str):
+        if axis not in _AXIS_VECTORS:
+            raise ValueError(f"axis must be 'x', 'y' or 'z', got {axis!r}")
+        k = np.array(_AXIS_VECTORS[axis])
+    else:
+        k = np.asarray(axis, dtype=float)
+        norm = np.linalg.norm(k, axis=-1, keepdims=True)
+        if np.any(norm == 0):
+            raise ValueError("rotation axis must be non-zero")
+        k = k / norm
+    angle_rad, kx, ky, kz = np.broadcast_arrays(angle_rad, k[..., 0], k[..., 1], k[..., 2])
+    angle_rad, kx, ky, kz = (a.reshape(-1) for a in (angle_rad, kx, ky, kz))
+    c = np.cos(angle_rad)
+    s = np.sin(angle_rad)
+    out = _identity_stack(len(c), out)
+    if isinstance(axis, str):
+        # Axis-aligned: fill the 2x2 block directly
+        i, j = {'x': (1, 2), 'y': (2, 0), 'z': (0, 1)}[axis]
+        out[:, i, i] = c
+        out[:, j, j] = c
+        out[:, i, j] = -s
+        out[:, j, i] = s
+        return out
+    # R = c*I + s*[k]x + (1-c)*k k^T
+    k = np.stack([kx, ky, kz], axis=-1)
+    out[:, :3, :3] = (1 - c)[:, None, None] * np.einsum('ni,nj->nij', k, k)
+    out[:, [0, 1, 2], [0, 1, 2]] += c[:, None]
+    out[:, 0, 1] -= s * kz
+    out[:, 0, 2] += s * ky
+    out[:, 1, 0] += s * kz
+    out[:, 1, 2] -= s * kx
+    out[:, 2, 0] -= s * ky
+    out[:, 2, 1] += s * kx
+    return out
+
+def scaling_matrices(scale_vectors, out=None):
+    """Stack of 4x4 scaling matrices, one per row of an (N,3) array"""
+    sv = np.asarray(scale_vectors, dtype=float).reshape(-1, 3)
+    out = _identity_stack(len(sv), out)
+    out[:, [0, 1, 2], [0, 1, 2]] = sv
+    return out
+
+def _batch_operands(matrices, params, width):
+    m = np.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+    p = np.asarray(params, dtype=float).reshape(-1, width)
+    n = max(len(m), len(p))
+    if len(m) not in (1, n) or len(p) not in (1, n):
+        raise ValueError(f"cannot broadcast {len(m)} matrices against {len(p)} parameters")
+    return np.broadcast_to(m, (n, 4, 4)), np.broadcast_to(p, (n, width)), n
+
+def translate_batch(matrices, translation_vectors, out=None):
+    """Batched `translate`: T_i @ M_i for each of the N matrices/vectors.
+
+    Either operand may be a single value, which is broadcast against the
+    other. `out` may alias `matrices`.
+    """
+    m, t, n = _batch_operands(matrices, translation_vectors, 3)
+    out = _matrix_stack(n, out)
+    # Only the top three rows change: row_i += t_i * row_3
+    w = m[:, 3, :].copy()
+    out[...] = m
+    out[:, :3, :] += t[:, :, None] * w[:, None, :]
+    return out
+
+def rotate_batch(matrices, angles, axis, out=None):
+    """Batched `rotate`: R_i @ M_i, see `rotation_matrices` for `axis`"""
+    r = rotation_matrices(angles, axis)
+    m, r, n = _batch_operands(matrices, r.reshape(-1, 16), 16)
+    out = _matrix_stack(n, out)
+    return np.matmul(r.reshape(n, 4, 4), m, out=out)
+
+def scale_batch(matrices, scale_vectors, out=None):
+    """Batched `scale`: S_i @ M_i; `out` may alias `matrices`"""
+    m, sv, n = _batch_operands(matrices, scale_vectors, 3)
+    out = _matrix_stack(n, out)
+    out[...] = m
+    out[:, :3, :] *= sv[:, :, None]
+    return out